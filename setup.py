@@ -25,13 +25,16 @@ setup(
         "yaml": ["pyyaml>=6.0"],  # only needed for YAML config file support
         "gcs": ["google-cloud-storage>=2.0.0"],
         "s3": ["boto3>=1.26.0"],
-        "azure": ["azure-storage-blob>=12.0.0"],
+        "azure": ["azure-storage-blob>=12.0.0", "azure-identity>=1.10.0"],
         "sftp": ["paramiko>=3.0.0"],
+        "lxml": ["lxml>=4.6.0"],  # faster link extraction
         "all": [
             "pyyaml>=6.0",
+            "lxml>=4.6.0",
             "google-cloud-storage>=2.0.0",
             "boto3>=1.26.0",
             "azure-storage-blob>=12.0.0",
+            "azure-identity>=1.10.0",
             "paramiko>=3.0.0",
         ],
     },
@@ -1,6 +1,7 @@
 import os
 import time
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
 from typing import List, Set, Optional, Dict, Any, Callable
 from collections import deque
@@ -9,12 +10,12 @@ import logging
 from src.models.crawler_stats import CrawlerStats
 from src.processors.config import HtmlProcessorConfig
 from src.processors.html_processor import HtmlProcessor
-from src.utils.url_utils import is_valid_url, url_to_filepath, should_add_to_queue
+from src.utils.url_utils import is_valid_url, url_to_filepath
 from src.utils.storage import StorageClient
 from src.utils.robots import RobotsTxtChecker
 from src.utils.rate_limiter import SimpleRateLimiter
 from src.utils.retry import retry_on_http_error
-from src.utils.sitemap import SitemapParser
+from src.utils.sitemap import SitemapParser, MAX_SITEMAP_WORKERS
 from src.exceptions import InvalidURLError, ContentTooLargeError, CrawlerError
 
 logger = logging.getLogger('DocuCrawler')
@@ -85,7 +86,9 @@ class DocuCrawler:
         
         self.visited_urls: Set[str] = set()
         self.urls_to_visit: deque = deque([start_url])
-        self.urls_in_queue: Set[str] = {start_url}
+        # every URL ever queued, visited or not, so a link needs one lookup
+        # and no URL is queued twice
+        self.known_urls: Set[str] = {start_url}
         self.stats = CrawlerStats()
         self.max_content_length = DEFAULT_MAX_CONTENT_LENGTH
         self.headers = {
@@ -105,10 +108,14 @@ class DocuCrawler:
         html_config = HtmlProcessorConfig(**html_config_args)
             
         self.html_processor = HtmlProcessor(config=html_config)
-        self.robots_checker = RobotsTxtChecker(headers=self.headers, timeout=timeout)
         self.rate_limiter = SimpleRateLimiter(delay=delay)
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        # the sitemap parser fans sub-sitemap downloads out over this session
+        adapter = HTTPAdapter(pool_maxsize=MAX_SITEMAP_WORKERS)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.robots_checker = RobotsTxtChecker(headers=self.headers, timeout=timeout, session=self.session)
         self._on_page_crawled_callback: Optional[Callable[[str, int], None]] = on_page_crawled
         self._on_error_callback: Optional[Callable[[str, Exception], None]] = on_error
         self.sitemap_parser = SitemapParser(session=self.session)
@@ -121,9 +128,9 @@ class DocuCrawler:
                 logger.info(f"Found {len(sitemap_urls)} URLs in sitemap.")
                 # dump all the sitemap URLs into our queue (we'll validate them later)
                 for url in sitemap_urls:
-                    if url not in self.urls_in_queue and url not in self.visited_urls:
+                    if url not in self.known_urls:
                         self.urls_to_visit.append(url)
-                        self.urls_in_queue.add(url)
+                        self.known_urls.add(url)
             else:
                 logger.warning("No URLs found in sitemap.")
         
@@ -187,7 +194,7 @@ class DocuCrawler:
         return url_to_filepath(url, self.base_path, self.output_dir)
     
     def process_page(self, url: str, response: requests.Response) -> Optional[List[str]]:
-        """Process downloaded page and extract links."""
+        """Process downloaded page and extract the links not yet visited or queued."""
         try:
             content_type = response.headers.get('Content-Type', '').lower()
             content_length = len(response.content)
@@ -232,14 +239,15 @@ class DocuCrawler:
                 except Exception as callback_error:
                     logger.warning(f"Error in page crawled callback: {callback_error}")
             
+            # the set lookup goes first, most links on a page (navigation,
+            # footers) were seen before and don't need validating again
             links = self.html_processor.extract_links(
                 response.text, 
                 url, 
-                lambda u: self.is_valid_url(u) and u not in self.visited_urls
+                lambda u: u not in self.known_urls and self.is_valid_url(u)
             )
             
-            new_links = sum(1 for link in links if link not in self.urls_to_visit)
-            logger.debug(f"Found {len(links)} links, {new_links} new")
+            logger.debug(f"Found {len(links)} new links")
             
             return links
         except Exception as e:
@@ -259,10 +267,6 @@ class DocuCrawler:
                     break
                 
                 current_url = self.urls_to_visit.popleft()
-                self.urls_in_queue.discard(current_url)
-                
-                if current_url in self.visited_urls:
-                    continue
                 
                 user_agent = self.headers.get('User-Agent', '*')
                 if not self.robots_checker.can_fetch(current_url, user_agent):
@@ -284,9 +288,10 @@ class DocuCrawler:
                         links = self.process_page(current_url, response)
                         if links:
                             for link in links:
-                                if link not in self.visited_urls and link not in self.urls_in_queue:
+                                # links are already filtered, this only drops repeats within the page
+                                if link not in self.known_urls:
                                     self.urls_to_visit.append(link)
-                                    self.urls_in_queue.add(link)
+                                    self.known_urls.add(link)
                         
                         if self.stats.pages_processed % DEFAULT_STATS_LOG_INTERVAL == 0:
                             self._log_stats()
@@ -1,8 +1,13 @@
+import sys
 from dataclasses import dataclass
 from typing import Optional, List
 from urllib.parse import urlparse
 
-@dataclass
+# slots make the per-element config reads a descriptor fetch instead of a
+# dict probe (dataclass only supports this from 3.10 on)
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_SLOTS)
 class HtmlProcessorConfig:
     """
     Configuration for HTML to Markdown conversion.
@@ -1,6 +1,10 @@
+import os
 import re
-from typing import List, Callable, Dict, Any, Optional
-from bs4 import BeautifulSoup, Tag, NavigableString
+import time
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Callable, Dict, Any, Optional, Set, Tuple
+from bs4 import BeautifulSoup, SoupStrainer, Tag, NavigableString
 from urllib.parse import urljoin, urldefrag
 import logging
 
@@ -8,6 +12,117 @@ from .config import HtmlProcessorConfig
 
 logger = logging.getLogger('DocuCrawler')
 
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# newlines are significant in the generated markdown, so whitespace is collapsed
+# with a tab translation plus a space-only regex rather than str.split()
+_TAB_TO_SPACE = str.maketrans('\t', ' ')
+_SPACE_RUN_RE = re.compile(r' +')
+_EXCESS_NEWLINES_RE = re.compile(r'\n{3,}')
+
+# single pass escaping for link text, urls and alt text
+_MD_ESCAPE_BRACKETS = str.maketrans({'[': '\\[', ']': '\\]'})
+_MD_ESCAPE_PARENS = str.maketrans({'(': '\\(', ')': '\\)'})
+_MD_ESCAPE_FULL = str.maketrans({'[': '\\[', ']': '\\]', '(': '\\(', ')': '\\)'})
+
+# pipes would split a table cell and newlines would end the row
+_TABLE_ESCAPE = str.maketrans({'|': '\\|', '\n': ' '})
+
+# containers that end with a paragraph break when they have no converter
+_PARAGRAPH_TAGS = frozenset(('p', 'div', 'section', 'article', 'main'))
+
+_LANGUAGE_CLASS_PREFIXES = ('language-', 'lang-', 'highlight-')
+
+# (expires_at, date) for the frontmatter date, refreshed at local midnight
+_DATE_CACHE: List[Any] = [0.0, '']
+
+def _today_str() -> str:
+    """
+    Get today's date as YYYY-MM-DD, formatting it at most once per day.
+    
+    Returns:
+        Current local date string
+    """
+    now = time.time()
+    if now >= _DATE_CACHE[0]:
+        today = time.localtime(now)
+        # mktime normalizes the day overflow, so this is the next local midnight
+        midnight = time.mktime((today.tm_year, today.tm_mon, today.tm_mday + 1, 0, 0, 0, 0, 0, -1))
+        _DATE_CACHE[:] = [midnight, time.strftime('%Y-%m-%d', today)]
+    return _DATE_CACHE[1]
+
+# converter precedence. when an element is converted, only the elements nested
+# inside it with a lower rank are turned into markdown, everything else counts as
+# plain text. this keeps the output the same as running one pass per element type
+_RANK_CODE_BLOCK = 0
+_RANK_INLINE_CODE = 1
+_RANK_TABLE = 2
+_RANK_LIST = 3
+_RANK_BLOCKQUOTE = 4
+_RANK_HR = 5
+_RANK_HEADING = 6  # h1 through h6 take ranks 6 to 11
+_RANK_IMAGE = 12
+_RANK_LINK = 13
+_RANK_EMPHASIS = 14
+_RANK_STRONG = 15
+_RANK_STRIKETHROUGH = 16
+_RANK_ALL = 17
+
+@functools.lru_cache(maxsize=256)
+def _parse_selector(selector: str) -> Optional[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    Split a simple main-content selector into (tag, attribute, value).
+    
+    Only the forms used in MAIN_CONTENT_SELECTORS are understood: 'tag',
+    'tag.class', 'tag#id' and 'tag[attr="value"]'.
+    
+    Args:
+        selector: Selector string to parse
+        
+    Returns:
+        Tuple of (tag, attribute, value), with attribute and value None for
+        a bare tag, or None if the selector is malformed
+    """
+    if '.' in selector:
+        tag, cls = selector.split('.', 1)
+        return tag, 'class', cls
+    if '#' in selector:
+        tag, id_ = selector.split('#', 1)
+        return tag, 'id', id_
+    if '[' in selector:
+        # simplistic handling for role="main"
+        tag, attr_part = selector.split('[', 1)
+        try:
+            attr, val = attr_part.rstrip(']').split('=', 1)
+        except ValueError:
+            # this selector looks broken, skip it
+            logger.debug(f"Invalid attribute selector format: {selector}")
+            return None
+        return tag, attr, val.strip('"\'')
+    return selector, None, None
+
+@functools.lru_cache(maxsize=512)
+def _detect_language(classes: Tuple[str, ...]) -> str:
+    """
+    Work out a code block's language from its CSS classes.
+    
+    Args:
+        classes: Tuple of class names from a <code> or <pre> element
+        
+    Returns:
+        Language name, or an empty string if none is found
+    """
+    for cls in classes:
+        if cls.startswith(_LANGUAGE_CLASS_PREFIXES):
+            return cls.split('-', 1)[1]
+        if cls.startswith('brush:'):
+            return cls.split(':', 1)[1]
+    return ''
+
 class HtmlProcessor:
     """
     Handles HTML content processing and conversion to Markdown.
@@ -26,6 +141,8 @@ class HtmlProcessor:
         ".ads", ".banner", ".cookie-notice", ".social-links"
     ]
     
+    FRONTMATTER_TEMPLATE = '---\ntitle: "{title}"\nsource: "{url}"\ndate: {date}\n---\n'
+    
     MARKDOWN_SUBSTITUTIONS = {
         'hr': '---',
         'br': '\n'
@@ -52,6 +169,28 @@ class HtmlProcessor:
                    If None, uses default configuration.
         """
         self.config = config or HtmlProcessorConfig()
+        
+        # tag name -> (rank, converter) used by the single pass tree walk
+        self._converters: Dict[str, Tuple[int, Callable[[Tag], Optional[str]]]] = {
+            'pre': (_RANK_CODE_BLOCK, self._convert_code_block),
+            'code': (_RANK_INLINE_CODE, self._convert_inline_code),
+            'table': (_RANK_TABLE, self._convert_table),
+            'ul': (_RANK_LIST, self._convert_list),
+            'ol': (_RANK_LIST, self._convert_list),
+            'blockquote': (_RANK_BLOCKQUOTE, self._convert_blockquote),
+            'hr': (_RANK_HR, self._convert_horizontal_rule),
+            'img': (_RANK_IMAGE, self._convert_image),
+            'a': (_RANK_LINK, self._convert_link),
+            'em': (_RANK_EMPHASIS, self._convert_emphasis),
+            'i': (_RANK_EMPHASIS, self._convert_emphasis),
+            'strong': (_RANK_STRONG, self._convert_strong),
+            'b': (_RANK_STRONG, self._convert_strong),
+            's': (_RANK_STRIKETHROUGH, self._convert_strikethrough),
+            'strike': (_RANK_STRIKETHROUGH, self._convert_strikethrough),
+            'del': (_RANK_STRIKETHROUGH, self._convert_strikethrough),
+        }
+        for level in range(1, 7):
+            self._converters[f'h{level}'] = (_RANK_HEADING + level - 1, self._convert_heading)
     
     def extract_text(self, html_content: str, url: str = '') -> str:
         """
@@ -73,38 +212,34 @@ class HtmlProcessor:
             if self.config.google_doc:
                 self._process_google_doc(soup)
             
-            for selector in HtmlProcessor.ELEMENTS_TO_REMOVE:
-                for element in soup.select(selector):
-                    element.decompose()
+            # one combined selector walks the tree once instead of once per selector;
+            # select() returns a list, so decomposing while looping is safe
+            for element in soup.select(_REMOVE_SELECTOR):
+                element.decompose()
             
             # find main content using defined selectors
             main_content = None
             
             # try our list of selectors first
+            present = None
             for selector in self.MAIN_CONTENT_SELECTORS:
-                if '.' in selector:
-                    tag, cls = selector.split('.', 1)
-                    main_content = soup.find(tag, class_=cls)
-                elif '#' in selector:
-                    tag, id_ = selector.split('#', 1)
-                    main_content = soup.find(tag, id=id_)
-                elif '[' in selector:
-                    # simplistic handling for role="main"
-                    tag = selector.split('[')[0]
-                    attr_part = selector.split('[')[1].rstrip(']')
-                    try:
-                        attr, val = attr_part.split('=', 1)
-                        val = val.strip('"\'')
-                        main_content = soup.find(tag, attrs={attr: val})
-                    except ValueError:
-                        # this selector looks broken, skip it
-                        logger.debug(f"Invalid attribute selector format: {selector}")
-                        continue
+                parsed = _parse_selector(selector)
+                if parsed is None:
+                    continue
+                # once a selector has missed, skip the ones that can't match
+                # instead of letting each of them scan the whole page
+                if present is not None and parsed not in present:
+                    continue
+                tag, attr, val = parsed
+                if attr is None:
+                    main_content = soup.find(tag)
                 else:
-                    main_content = soup.find(selector)
+                    main_content = soup.find(tag, attrs={attr: val})
                 
                 if main_content:
                     break
+                if present is None:
+                    present = self._selector_keys(soup)
             
             # look for divs with content or doc in the class name
             if not main_content:
@@ -126,14 +261,15 @@ class HtmlProcessor:
                 title = soup.title.string.strip() if soup.title and soup.title.string else 'Untitled Page'
                 return f"# {title}\n\nNo main content could be extracted from this page."
                 
-            content_copy = BeautifulSoup(str(main_content), 'html.parser')
             title = soup.title.string.strip() if soup.title and soup.title.string else 'Untitled Page'
             if ' | ' in title:
                 title = title.split(' | ')[0].strip()
             elif ' - ' in title:
                 title = title.split(' - ')[0].strip()
-                
-            markdown_content = self._convert_to_markdown(content_copy)
+            
+            # the soup isn't used after this point, so convert the subtree in place
+            # instead of serializing and reparsing it
+            markdown_content = self._convert_to_markdown(main_content)
             
             if self.config.include_frontmatter:
                 markdown_content = self._add_frontmatter(markdown_content, title, url)
@@ -152,6 +288,37 @@ class HtmlProcessor:
             logger.error(f"Error converting HTML to Markdown: {str(e)}", exc_info=True)
             return self._simple_html_to_markdown(html_content)
     
+    def _selector_keys(self, soup: BeautifulSoup) -> Set[Tuple[str, Optional[str], Optional[str]]]:
+        """
+        Collect the (tag, attribute, value) keys present in the tree.
+        
+        Keys have the same shape as _parse_selector results, so checking a
+        selector against the page is a set lookup instead of a tree scan.
+        
+        Args:
+            soup: BeautifulSoup object to index
+            
+        Returns:
+            Set of keys for every element, its classes, id and other
+            attributes used by MAIN_CONTENT_SELECTORS
+        """
+        attrs = {parsed[1] for parsed in map(_parse_selector, self.MAIN_CONTENT_SELECTORS)
+                 if parsed and parsed[1]}
+        keys = set()
+        for element in soup.find_all(True):
+            name = element.name
+            keys.add((name, None, None))
+            for attr in attrs:
+                value = element.get(attr)
+                if value is None:
+                    continue
+                if isinstance(value, list):
+                    for item in value:
+                        keys.add((name, attr, item))
+                else:
+                    keys.add((name, attr, value))
+        return keys
+    
     def _add_frontmatter(self, markdown: str, title: str, url: str) -> str:
         """
         Add YAML frontmatter to the markdown content.
@@ -164,101 +331,103 @@ class HtmlProcessor:
         Returns:
             Markdown with frontmatter prepended
         """
-        import time
-        date = time.strftime('%Y-%m-%d')
-        
-        frontmatter = [
-            '---',
-            f'title: "{title}"',
-            f'source: "{url}"',
-            f'date: {date}',
-            '---',
-            ''
-        ]
-        
         # stick the frontmatter at the top, keep any existing H1 titles in the content
-        
-        return '\n'.join(frontmatter) + markdown
+        return self.FRONTMATTER_TEMPLATE.format(title=title, url=url, date=_today_str()) + markdown
 
-    def _convert_to_markdown(self, soup: BeautifulSoup) -> str:
+    def _convert_to_markdown(self, soup: Tag) -> str:
         """
         Recursively convert HTML content to Markdown with proper structure.
         
+        The tree is walked once and each element is rendered straight to a
+        markdown fragment, so the tree itself is never modified.
+        
         Args:
-            soup: BeautifulSoup object to convert
+            soup: BeautifulSoup object or Tag to convert
             
         Returns:
             Converted Markdown string
         """
-        self._process_code(soup)
-        self._process_tables(soup)
-        self._process_lists(soup)
-        self._process_blockquotes(soup)
-        self._process_horizontal_rules(soup)
-        self._process_headings(soup)
-        if not self.config.ignore_images:
-            self._process_images(soup)
-        if not self.config.ignore_links:
-            self._process_links(soup)
-        self._process_text_formatting(soup)
-        
-        return self._build_markdown_from_tree(soup)
-    
-    def _build_markdown_from_tree(self, element) -> str:
+        return self._build_markdown_from_tree(soup).strip()
+    
+    def _convert_element(self, element: Tag, limit: int) -> Optional[str]:
+        """
+        Convert a single element to Markdown if it has a converter ranked below limit.
+        
+        Args:
+            element: BeautifulSoup Tag
+            limit: Only converters with a lower rank are applied
+            
+        Returns:
+            Markdown fragment, or None if the element should be treated as
+            plain content
+        """
+        entry = self._converters.get(element.name)
+        if entry is None or entry[0] >= limit:
+            return None
+        return entry[1](element)
+    
+    def _build_markdown_from_tree(self, element, limit: int = _RANK_ALL) -> str:
         """
         Build markdown by traversing the element tree.
         
         Args:
             element: BeautifulSoup element or Tag
+            limit: Rank limit for converting nested elements (see _converters)
             
         Returns:
             Markdown string
         """
         if isinstance(element, NavigableString):
-            text = str(element)
-            text = re.sub(r'[ \t]+', ' ', text)
+            text = str(element).translate(_TAB_TO_SPACE)
+            if '  ' in text:
+                text = _SPACE_RUN_RE.sub(' ', text)
             return text
         
         if not hasattr(element, 'children'):
             return ''
         
         markdown_parts = []
+        append = markdown_parts.append
+        converters = self._converters
+        build = self._build_markdown_from_tree
         
+        # element.children only yields strings and tags, so anything that
+        # isn't a NavigableString can go straight to the converter lookup
         for child in element.children:
             if isinstance(child, NavigableString):
                 text = str(child).strip()
                 if text:
-                    markdown_parts.append(text)
-            elif hasattr(child, 'name'):
-                tag_name = child.name
-                
-                if tag_name in ['p', 'div', 'section', 'article', 'main']:
-                    child_md = self._build_markdown_from_tree(child).strip()
-                    if child_md:
-                        markdown_parts.append(child_md)
-                        markdown_parts.append('')
-                
-                elif tag_name and tag_name.startswith('h') and tag_name[1:].isdigit():
-                    child_md = self._build_markdown_from_tree(child).strip()
-                    if child_md:
-                        markdown_parts.append(child_md)
-                        markdown_parts.append('')
-                
-                elif tag_name in ['ul', 'ol', 'li']:
-                    child_md = self._build_markdown_from_tree(child).strip()
-                    if child_md:
-                        markdown_parts.append(child_md)
-                
-                elif tag_name == 'br':
-                    markdown_parts.append('\n')
-                else:
-                    child_md = self._build_markdown_from_tree(child).strip()
-                    if child_md:
-                        markdown_parts.append(child_md)
+                    append(text)
+                continue
+            
+            tag_name = child.name
+            entry = converters.get(tag_name)
+            if entry is not None and entry[0] < limit:
+                converted = entry[1](child)
+                if converted is not None:
+                    converted = converted.strip()
+                    if converted:
+                        append(converted)
+                    continue
+            
+            if tag_name == 'br':
+                append('\n')
+                continue
+            
+            child_md = build(child, limit).strip()
+            if not child_md:
+                continue
+            append(child_md)
+            if tag_name in _PARAGRAPH_TAGS or (tag_name.startswith('h') and tag_name[1:].isdigit()):
+                append('')
         
         result = ' '.join(markdown_parts)
-        result = re.sub(r' +', ' ', result)
-        result = re.sub(r'\n{3,}', '\n\n', result)
+        # this runs at every level of the recursion, so only pay for the regex
+        # when there is actually something to collapse
+        if '  ' in result:
+            result = _SPACE_RUN_RE.sub(' ', result)
+        if '\n\n\n' in result:
+            result = _EXCESS_NEWLINES_RE.sub('\n\n', result)
         
         return result
     
@@ -356,158 +525,96 @@ class HtmlProcessor:
             # last resort error message (when even the simple converter gives up)
             return "# Error Converting Page\n\nThere was an error converting this page to Markdown."
     
-    def _process_headings(self, content):
-        """Process HTML headings to Markdown format."""
-        for i in range(1, 7):
-            for heading in content.find_all(f'h{i}'):
-                if heading.get('data-processed'):
-                    continue
-                heading_text = self._get_inline_text(heading).strip()
-                if heading_text:
-                    heading_md = '#' * i
-                    heading.replace_with(NavigableString(f"{heading_md} {heading_text}"))
-                    heading['data-processed'] = 'true'
-    
-    def _process_links(self, content):
-        """Process HTML links to Markdown format."""
-        for link in content.find_all('a', href=True):
-            if link.get('data-processed'):
-                continue
-            
-            href = link['href']
-            if self.config.should_skip_link(href):
-                link_text = self._get_inline_text(link).strip() or href
-                link.replace_with(NavigableString(link_text))
-                link['data-processed'] = 'true'
-                continue
-            
-            link_text = self._get_inline_text(link).strip()
-            if not link_text:
-                link_text = href
-            
-            if self.config.escape_snob:
-                link_text = link_text.replace('[', '\\[').replace(']', '\\]')
-                href = href.replace('(', '\\(').replace(')', '\\)')
-            else:
-                link_text = link_text.replace('[', '\\[').replace(']', '\\]')
-            
-            if self.config.wrap_links and len(href) > 50:
-                link_md = f"[{link_text}]({href})"
-            else:
-                link_md = f"[{link_text}]({href})"
-            
-            link.replace_with(NavigableString(link_md))
-            link['data-processed'] = 'true'
+    def _convert_heading(self, heading) -> Optional[str]:
+        """Convert an HTML heading to Markdown format."""
+        level = int(heading.name[1])
+        heading_text = self._get_inline_text(heading, _RANK_HEADING + level - 1).strip()
+        if not heading_text:
+            return None
+        return f"{'#' * level} {heading_text}"
     
-    def _process_images(self, content):
-        """Process HTML images to Markdown format."""
-        for img in content.find_all('img', src=True):
-            if img.get('data-processed'):
-                continue
-            alt_text = img.get('alt', '').strip() or img.get('title', '').strip() or 'Image'
-            src = img['src']
-            
-            if self.config.escape_snob:
-                alt_text = alt_text.replace('[', '\\[').replace(']', '\\]').replace('(', '\\(').replace(')', '\\)')
-            else:
-                alt_text = alt_text.replace('[', '\\[').replace(']', '\\]').replace('(', '\\(').replace(')', '\\)')
-            
-            img.replace_with(NavigableString(f"![{alt_text}]({src})"))
-            img['data-processed'] = 'true'
+    def _convert_link(self, link) -> Optional[str]:
+        """Convert an HTML link to Markdown format."""
+        href = link.get('href')
+        cfg = self.config
+        if href is None or cfg.ignore_links:
+            return None
+        
+        link_text = self._get_inline_text(link, _RANK_LINK).strip()
+        if cfg.should_skip_link(href):
+            return link_text or href
+        
+        if not link_text:
+            link_text = href
+        
+        link_text = link_text.translate(_MD_ESCAPE_BRACKETS)
+        if cfg.escape_snob:
+            href = href.translate(_MD_ESCAPE_PARENS)
+        
+        return f"[{link_text}]({href})"
     
-    def _process_code(self, content):
-        """Process HTML code blocks and inline code to Markdown format."""
-        for pre in content.find_all('pre'):
-            if pre.get('data-processed'):
-                continue
-            
-            code_element = pre.find('code')
-            if code_element:
-                language = ''
-                if code_element.get('class'):
-                    for cls in code_element.get('class'):
-                        if cls.startswith(('language-', 'lang-', 'highlight-')):
-                            parts = cls.split('-', 1)
-                            if len(parts) > 1:
-                                language = parts[1]
-                            break
-                        elif cls.startswith('brush:'):
-                            try:
-                                language = cls.split(':', 1)[1]
-                            except IndexError:
-                                language = ''
-                            break
-                
-                if not language and pre.get('class'):
-                    for cls in pre.get('class'):
-                        if cls.startswith(('language-', 'lang-', 'highlight-')):
-                            parts = cls.split('-', 1)
-                            if len(parts) > 1:
-                                language = parts[1]
-                            break
-                        elif cls.startswith('brush:'):
-                            try:
-                                language = cls.split(':', 1)[1]
-                            except IndexError:
-                                language = ''
-                            break
-                
-                code_text = code_element.get_text()
-                pre.replace_with(NavigableString(f"\n```{language}\n{code_text}\n```\n"))
-                pre['data-processed'] = 'true'
-            else:
-                code_text = pre.get_text()
-                pre.replace_with(NavigableString(f"\n```\n{code_text}\n```\n"))
-                pre['data-processed'] = 'true'
+    def _convert_image(self, img) -> Optional[str]:
+        """Convert an HTML image to Markdown format."""
+        src = img.get('src')
+        if src is None or self.config.ignore_images:
+            return None
+        alt_text = img.get('alt', '').strip() or img.get('title', '').strip() or 'Image'
         
-        for code in content.find_all('code'):
-            if code.parent and code.parent.name == 'pre':
-                continue
-            if code.get('data-processed'):
-                continue
-            
-            code_text = code.get_text()
-            if self.config.escape_snob:
-                code_text = code_text.replace('`', '\\`').replace('*', '\\*').replace('_', '\\_')
-            else:
-                code_text = code_text.replace('`', '\\`')
-            code.replace_with(NavigableString(f"`{code_text}`"))
-            code['data-processed'] = 'true'
-    
-    def _process_text_formatting(self, content):
-        """Process HTML text formatting to Markdown format."""
-        for em in content.find_all(['em', 'i']):
-            if em.get('data-processed'):
-                continue
-            em_text = self._get_inline_text(em).strip()
-            if em_text:
-                em.replace_with(NavigableString(f"*{em_text}*"))
-                em['data-processed'] = 'true'
+        alt_text = alt_text.translate(_MD_ESCAPE_FULL)
         
-        for strong in content.find_all(['strong', 'b']):
-            if strong.get('data-processed'):
-                continue
-            strong_text = self._get_inline_text(strong).strip()
-            if strong_text:
-                strong.replace_with(NavigableString(f"**{strong_text}**"))
-                strong['data-processed'] = 'true'
-
-        if not self.config.hide_strikethrough:
-            for s in content.find_all(['s', 'strike', 'del']):
-                if s.get('data-processed'):
-                    continue
-                s_text = self._get_inline_text(s).strip()
-                if s_text:
-                    s.replace_with(NavigableString(f"~~{s_text}~~"))
-                    s['data-processed'] = 'true'
+        return f"![{alt_text}]({src})"
+    
+    def _convert_code_block(self, pre) -> str:
+        """Convert an HTML pre block to a fenced Markdown code block."""
+        code_element = pre.find('code')
+        if code_element:
+            language = _detect_language(tuple(code_element.get('class') or ()))
+            if not language:
+                language = _detect_language(tuple(pre.get('class') or ()))
+            
+            code_text = code_element.get_text()
+            return f"\n```{language}\n{code_text}\n```\n"
+        
+        code_text = pre.get_text()
+        return f"\n```\n{code_text}\n```\n"
+    
+    def _convert_inline_code(self, code) -> Optional[str]:
+        """Convert HTML inline code to Markdown format."""
+        if code.parent and code.parent.name == 'pre':
+            return None
+        
+        code_text = code.get_text()
+        if self.config.escape_snob:
+            code_text = code_text.replace('`', '\\`').replace('*', '\\*').replace('_', '\\_')
+        else:
+            code_text = code_text.replace('`', '\\`')
+        return f"`{code_text}`"
+    
+    def _convert_emphasis(self, em) -> Optional[str]:
+        """Convert HTML emphasis to Markdown format."""
+        em_text = self._get_inline_text(em, _RANK_EMPHASIS).strip()
+        return f"*{em_text}*" if em_text else None
     
-    def _get_inline_text(self, element) -> str:
+    def _convert_strong(self, strong) -> Optional[str]:
+        """Convert HTML strong/bold text to Markdown format."""
+        strong_text = self._get_inline_text(strong, _RANK_STRONG).strip()
+        return f"**{strong_text}**" if strong_text else None
+    
+    def _convert_strikethrough(self, s) -> Optional[str]:
+        """Convert HTML strikethrough text to Markdown format."""
+        if self.config.hide_strikethrough:
+            return None
+        s_text = self._get_inline_text(s, _RANK_STRIKETHROUGH).strip()
+        return f"~~{s_text}~~" if s_text else None
+    
+    def _get_inline_text(self, element, limit: int = _RANK_ALL) -> str:
         """
         Get text content from an element, preserving inline formatting.
         This is used for elements that should preserve their children's formatting.
         
         Args:
             element: BeautifulSoup element
+            limit: Rank limit for converting nested elements (see _converters)
             
         Returns:
             Text content with formatting preserved
@@ -520,43 +627,42 @@ class HtmlProcessor:
             if isinstance(child, NavigableString):
                 parts.append(str(child))
             elif hasattr(child, 'name'):
-                parts.append(self._get_inline_text(child))
+                converted = self._convert_element(child, limit)
+                if converted is None:
+                    converted = self._get_inline_text(child, limit)
+                parts.append(converted)
         
         return ''.join(parts)
     
-    def _process_lists(self, content):
-        """Process HTML lists to Markdown format with proper nesting."""
-        for list_tag in content.find_all(['ul', 'ol']):
-            if list_tag.get('data-processed'):
-                continue
-            
-            list_items = []
+    def _convert_list(self, list_tag) -> Optional[str]:
+        """Convert an HTML list to Markdown format with proper nesting."""
+        list_items = []
 
-            if list_tag.name == 'ol':
-                start = list_tag.get('start', 1)
-                try:
-                    start = int(start)
-                except (ValueError, TypeError):
-                    start = 1
-                
-                for i, li in enumerate(list_tag.find_all('li', recursive=False), start):
-                    li_content = self._process_list_item(li)
-                    if li_content.strip():
-                        list_items.append(f"{i}. {li_content}")
+        if list_tag.name == 'ol':
+            start = list_tag.get('start', 1)
+            try:
+                start = int(start)
+            except (ValueError, TypeError):
+                start = 1
+            
+            for i, li in enumerate(list_tag.find_all('li', recursive=False), start):
+                li_content = self._convert_list_item(li)
+                if li_content.strip():
+                    list_items.append(f"{i}. {li_content}")
 
-            elif list_tag.name == 'ul':
-                marker = '-' if self.config.dash_unordered_list else '*'
-                for li in list_tag.find_all('li', recursive=False):
-                    li_content = self._process_list_item(li)
-                    if li_content.strip():
-                        list_items.append(f"{marker} {li_content}")
+        elif list_tag.name == 'ul':
+            marker = '-' if self.config.dash_unordered_list else '*'
+            for li in list_tag.find_all('li', recursive=False):
+                li_content = self._convert_list_item(li)
+                if li_content.strip():
+                    list_items.append(f"{marker} {li_content}")
 
-            if list_items:
-                list_markdown = '\n'.join(list_items)
-                list_tag.replace_with(NavigableString(f"\n{list_markdown}\n"))
-                list_tag['data-processed'] = 'true'
+        if not list_items:
+            return None
+        list_markdown = '\n'.join(list_items)
+        return f"\n{list_markdown}\n"
     
-    def _process_list_item(self, li) -> str:
+    def _convert_list_item(self, li) -> str:
         """
         Process a single list item, handling nested content.
         
@@ -577,119 +683,104 @@ class HtmlProcessor:
                 tag_name = child.name
                 
                 if tag_name in ['ul', 'ol']:
-                    self._process_lists(child)
-                    nested_md = self._build_markdown_from_tree(child).strip()
+                    # lists nested further down are converted, this one is flattened
+                    nested_md = self._build_markdown_from_tree(child, _RANK_LIST + 1).strip()
                     if nested_md:
-                        indented = '\n'.join('  ' + line if line.strip() else line 
-                                           for line in nested_md.split('\n'))
+                        indented = '\n'.join(['  ' + line if line and not line.isspace() else line
+                                            for line in nested_md.split('\n')])
                         parts.append(indented)
-                else:
-                    child_md = self._build_markdown_from_tree(child).strip()
-                    if child_md:
-                        parts.append(child_md)
+                    continue
+                
+                child_md = self._convert_element(child, _RANK_LIST)
+                if child_md is None:
+                    child_md = self._build_markdown_from_tree(child, _RANK_LIST)
+                child_md = child_md.strip()
+                if child_md:
+                    parts.append(child_md)
         
         return ' '.join(parts).strip()
     
-    def _process_tables(self, content):
-        """Process HTML tables to Markdown format."""
-        for table in content.find_all('table'):
-            if table.get('data-processed'):
-                continue
-            
-            markdown_table = []
-            header_cells = None
-            
-            if table.find('thead'):
-                header_cells = table.find('thead').find_all('th')
-                if header_cells:
-                    cell_texts = []
-                    for cell in header_cells:
-                        cell_text = self._build_markdown_from_tree(cell).strip()
-                        cell_text = cell_text.replace('|', '\\|').replace('\n', ' ')
-                        cell_texts.append(cell_text)
-                    header_row = '| ' + ' | '.join(cell_texts) + ' |'
-                    separator_row = '| ' + ' | '.join(['---'] * len(header_cells)) + ' |'
-                    markdown_table.append(header_row)
-                    markdown_table.append(separator_row)
-
-            if table.find('tbody'):
-                tbody = table.find('tbody')
-                header_cols = len(header_cells) if header_cells else None
-                for row in tbody.find_all('tr'):
-                    cells = row.find_all(['td', 'th'])
-                    if not cells:
-                        continue
-                    
-                    cell_texts = []
-                    for cell in cells:
-                        cell_text = self._build_markdown_from_tree(cell).strip()
-                        cell_text = cell_text.replace('|', '\\|').replace('\n', ' ')
-                        cell_texts.append(cell_text)
-                    
-                    if header_cols and len(cell_texts) != header_cols:
-                        cell_texts.extend([''] * (header_cols - len(cell_texts)))
-                    
-                    row_text = '| ' + ' | '.join(cell_texts) + ' |'
-                    markdown_table.append(row_text)
+    def _convert_table(self, table) -> Optional[str]:
+        """Convert an HTML table to Markdown format."""
+        markdown_table = []
+        header_cells = None
+        
+        if table.find('thead'):
+            header_cells = table.find('thead').find_all('th')
+            if header_cells:
+                cell_texts = self._table_cells(header_cells)
+                header_row = '| ' + ' | '.join(cell_texts) + ' |'
+                separator_row = '| ' + ' | '.join(['---'] * len(header_cells)) + ' |'
+                markdown_table.append(header_row)
+                markdown_table.append(separator_row)
 
-            if not markdown_table:
-                rows = table.find_all('tr')
-                has_header = False
-                first_row_cells = None
+        if table.find('tbody'):
+            tbody = table.find('tbody')
+            header_cols = len(header_cells) if header_cells else None
+            for row in tbody.find_all('tr'):
+                cells = row.find_all(['td', 'th'])
+                if not cells:
+                    continue
                 
-                for i, row in enumerate(rows):
-                    cells = row.find_all(['td', 'th'])
-                    if not cells:
-                        continue
-                    
-                    if first_row_cells is None:
-                        first_row_cells = cells
-                    
-                    cell_texts = []
-                    for cell in cells:
-                        cell_text = self._build_markdown_from_tree(cell).strip()
-                        cell_text = cell_text.replace('|', '\\|').replace('\n', ' ')
-                        cell_texts.append(cell_text)
-                    
-                    row_text = '| ' + ' | '.join(cell_texts) + ' |'
-                    markdown_table.append(row_text)
-                    
-                    if i == 0 and any(cell.name == 'th' for cell in cells) and not has_header:
-                        separator_row = '| ' + ' | '.join(['---'] * len(cells)) + ' |'
-                        markdown_table.insert(1, separator_row)
-                        has_header = True
-                    
-                    if not has_header and i == 0 and first_row_cells:
-                        num_cols = len(first_row_cells)
-                        separator_row = '| ' + ' | '.join(['---'] * num_cols) + ' |'
-                        markdown_table.insert(1, separator_row)
-                        has_header = True
-            
-            if markdown_table:
-                table.replace_with(NavigableString('\n' + '\n'.join(markdown_table) + '\n'))
-                table['data-processed'] = 'true'
-    
-    def _process_blockquotes(self, content):
-        """Process HTML blockquotes to Markdown format."""
-        for blockquote in content.find_all('blockquote'):
-            if blockquote.get('data-processed'):
-                continue
+                cell_texts = self._table_cells(cells)
+                
+                if header_cols and len(cell_texts) != header_cols:
+                    cell_texts.extend([''] * (header_cols - len(cell_texts)))
+                
+                row_text = '| ' + ' | '.join(cell_texts) + ' |'
+                markdown_table.append(row_text)
 
-            quote_content = self._build_markdown_from_tree(blockquote).strip()
+        if not markdown_table:
+            rows = table.find_all('tr')
+            has_header = False
+            first_row_cells = None
+            
+            for i, row in enumerate(rows):
+                cells = row.find_all(['td', 'th'])
+                if not cells:
+                    continue
+                
+                if first_row_cells is None:
+                    first_row_cells = cells
+                
+                cell_texts = self._table_cells(cells)
+                
+                row_text = '| ' + ' | '.join(cell_texts) + ' |'
+                markdown_table.append(row_text)
+                
+                if i == 0 and any(cell.name == 'th' for cell in cells) and not has_header:
+                    separator_row = '| ' + ' | '.join(['---'] * len(cells)) + ' |'
+                    markdown_table.insert(1, separator_row)
+                    has_header = True
+                
+                if not has_header and i == 0 and first_row_cells:
+                    num_cols = len(first_row_cells)
+                    separator_row = '| ' + ' | '.join(['---'] * num_cols) + ' |'
+                    markdown_table.insert(1, separator_row)
+                    has_header = True
+        
+        if not markdown_table:
+            return None
+        return '\n' + '\n'.join(markdown_table) + '\n'
+    
+    def _table_cells(self, cells) -> List[str]:
+        """Render table cells as escaped single-line Markdown text."""
+        return [self._build_markdown_from_tree(cell, _RANK_TABLE).strip().translate(_TABLE_ESCAPE)
+                for cell in cells]
+    
+    def _convert_blockquote(self, blockquote) -> str:
+        """Convert an HTML blockquote to Markdown format."""
+        quote_content = self._build_markdown_from_tree(blockquote, _RANK_BLOCKQUOTE).strip()
 
-            formatted_quote = '\n'.join(f"> {line}" if line.strip() else ">" 
-                                       for line in quote_content.split('\n'))
-            
-            blockquote.replace_with(NavigableString(f"\n{formatted_quote}\n"))
-            blockquote['data-processed'] = 'true'
+        # isspace() answers the blank-line question without allocating a stripped copy
+        formatted_quote = '\n'.join(['> ' + line if line and not line.isspace() else '>'
+                                     for line in quote_content.split('\n')])
+        
+        return f"\n{formatted_quote}\n"
     
-    def _process_horizontal_rules(self, content):
-        """Process HTML horizontal rules to Markdown format."""
-        for hr in content.find_all('hr'):
-            if hr.get('data-processed'):
-                continue
-            hr.replace_with(NavigableString("\n---\n"))
-            hr['data-processed'] = 'true'
+    def _convert_horizontal_rule(self, hr) -> str:
+        """Convert an HTML horizontal rule to Markdown format."""
+        return "\n---\n"
     
     def _process_google_doc(self, soup):
         """Process Google Docs specific HTML formatting."""
@@ -721,16 +812,10 @@ class HtmlProcessor:
         Returns:
             List of extracted URLs
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
         links = []
         
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag['href']
-
-            if (href.startswith('#') or 
-                href.startswith('javascript:') or 
-                href.startswith('mailto:') or
-                href.startswith('tel:')):
+        for href in HtmlProcessor._iter_hrefs(html_content):
+            if href.startswith(('#', 'javascript:', 'mailto:', 'tel:')):
                 continue
 
             absolute_url = urljoin(current_url, href)
@@ -743,6 +828,32 @@ class HtmlProcessor:
                 
         return links
     
+    @staticmethod
+    def _iter_hrefs(html_content: str) -> List[str]:
+        """
+        Collect the raw href of every <a> tag in document order.
+        
+        Uses lxml's C parser when it's installed, otherwise a BeautifulSoup
+        parse restricted to <a> tags so the rest of the tree is never built.
+        
+        Args:
+            html_content: HTML content to parse
+            
+        Returns:
+            List of href attribute values
+        """
+        if LXML_AVAILABLE:
+            try:
+                doc = lxml.html.fromstring(html_content)
+                return [a.get('href') for a in doc.iter('a') if a.get('href') is not None]
+            except (ValueError, lxml.etree.ParserError) as e:
+                # empty documents or strings with an encoding declaration
+                logger.debug(f"lxml could not parse page for links, falling back: {str(e)}")
+        
+        only_links = SoupStrainer('a', href=True)
+        soup = BeautifulSoup(html_content, 'html.parser', parse_only=only_links)
+        return [a_tag['href'] for a_tag in soup.find_all('a', href=True)]
+    
     @staticmethod
     def extract_text_static(html_content: str, url: str = '', config: Optional[HtmlProcessorConfig] = None) -> str:
         """
@@ -757,4 +868,44 @@ class HtmlProcessor:
             Extracted content in Markdown format
         """
         processor = HtmlProcessor(config)
-        return processor.extract_text(html_content, url)
\ No newline at end of file
+        return processor.extract_text(html_content, url)
+    
+    @staticmethod
+    def extract_text_batch(pages: List[Tuple[str, str]], config: Optional[HtmlProcessorConfig] = None,
+                           max_workers: Optional[int] = None) -> List[str]:
+        """
+        Convert many pages to Markdown in parallel worker processes.
+        
+        Conversion is pure Python and holds the GIL, so threads don't help;
+        each worker process gets its own processor instead.
+        
+        Args:
+            pages: List of (html_content, url) tuples
+            config: Optional configuration shared by all pages
+            max_workers: Number of worker processes (defaults to CPU count)
+            
+        Returns:
+            Markdown strings in the same order as pages
+        """
+        if not pages:
+            return []
+        
+        # not worth spinning up a pool for a single page
+        if len(pages) == 1 or max_workers == 1:
+            processor = HtmlProcessor(config)
+            return [processor.extract_text(html_content, url) for html_content, url in pages]
+        
+        tasks = [(html_content, url, config) for html_content, url in pages]
+        workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_extract_one, tasks, chunksize=chunksize))
+
+
+def _extract_one(task: Tuple[str, str, Optional[HtmlProcessorConfig]]) -> str:
+    """Worker entry point for extract_text_batch (module level so it pickles)."""
+    html_content, url, config = task
+    return HtmlProcessor(config).extract_text(html_content, url)
+
+
+_REMOVE_SELECTOR = ', '.join(HtmlProcessor.ELEMENTS_TO_REMOVE)
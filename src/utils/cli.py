@@ -1,36 +1,19 @@
+import sys
 import argparse
+import functools
 import logging
-from typing import Tuple, Any
+from typing import Tuple, Any, Callable, List, Optional
 
-def parse_args() -> argparse.Namespace:
-    """
-    Parse command line arguments for the crawler.
-    
-    Returns:
-        Namespace containing the parsed arguments
-    """
-    parser = argparse.ArgumentParser(description='Docu Crawler - Web Crawler Library')
-    parser.add_argument('url', nargs='?', help='The starting URL of the documentation')
-    parser.add_argument('--output', help='Output directory for downloaded files (default: downloaded_docs)')
-    parser.add_argument('--delay', type=float, help='Delay between requests in seconds (default: 1.0)')
-    parser.add_argument('--log-level', 
-                        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
-                        help='Set the logging level (default: INFO)')
-    parser.add_argument('--max-pages', type=int, 
-                        help='Maximum number of pages to download (0 for unlimited, default: 0)')
-    parser.add_argument('--timeout', type=int,
-                        help='Request timeout in seconds (default: 10)')
-    parser.add_argument('--single-file', action='store_true',
-                        help='Combine all crawled pages into a single Markdown file (default: False)')
-    parser.add_argument('--frontmatter', action='store_true',
-                        help='Add YAML frontmatter to Markdown files (default: False)')
-    
+_LOG_LEVELS = {name: getattr(logging, name) for name in ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')}
+
+def _add_storage_options(parser: argparse.ArgumentParser) -> None:
     storage_group = parser.add_argument_group('Storage options')
     storage_group.add_argument('--storage-type', 
                               choices=['local', 'gcs', 's3', 'azure', 'sftp'],
                               default='local',
                               help='Storage backend type (default: local)')
-    
+
+def _add_gcs_options(parser: argparse.ArgumentParser) -> None:
     gcs_group = parser.add_argument_group('Google Cloud Storage options')
     gcs_group.add_argument('--use-gcs', action='store_true',
                            help='Store files in Google Cloud Storage (deprecated: use --storage-type gcs)')
@@ -40,7 +23,8 @@ def parse_args() -> argparse.Namespace:
                            help='Google Cloud project ID (if not specified, uses the project from credentials)')
     gcs_group.add_argument('--credentials', 
                            help='Path to Google Cloud credentials JSON file')
-    
+
+def _add_s3_options(parser: argparse.ArgumentParser) -> None:
     s3_group = parser.add_argument_group('AWS S3 Storage options')
     s3_group.add_argument('--s3-bucket', 
                           help='S3 bucket name (required if --storage-type s3)')
@@ -48,13 +32,15 @@ def parse_args() -> argparse.Namespace:
                           help='AWS region (e.g., us-east-1, default: from AWS_DEFAULT_REGION env)')
     s3_group.add_argument('--s3-endpoint-url',
                           help='Custom S3 endpoint URL (for S3-compatible services)')
-    
+
+def _add_azure_options(parser: argparse.ArgumentParser) -> None:
     azure_group = parser.add_argument_group('Azure Blob Storage options')
     azure_group.add_argument('--azure-container',
                              help='Azure container name (required if --storage-type azure)')
     azure_group.add_argument('--azure-connection-string',
                              help='Azure storage connection string')
-    
+
+def _add_sftp_options(parser: argparse.ArgumentParser) -> None:
     sftp_group = parser.add_argument_group('SFTP Storage options')
     sftp_group.add_argument('--sftp-host',
                             help='SFTP server hostname (required if --storage-type sftp)')
@@ -68,12 +54,96 @@ def parse_args() -> argparse.Namespace:
                             help='Path to SSH private key file')
     sftp_group.add_argument('--sftp-remote-path',
                             help='Base remote path for SFTP storage')
+
+# storage groups are only built when the command line mentions one of their
+# options (or asks for help), most runs never touch them
+_STORAGE_GROUPS: List[Tuple[Tuple[str, ...], Callable[[argparse.ArgumentParser], None]]] = [
+    (('--storage-type',), _add_storage_options),
+    (('--use-gcs', '--bucket', '--project', '--credentials'), _add_gcs_options),
+    (('--s3-bucket', '--s3-region', '--s3-endpoint-url'), _add_s3_options),
+    (('--azure-container', '--azure-connection-string'), _add_azure_options),
+    (('--sftp-host', '--sftp-user', '--sftp-password', '--sftp-port',
+      '--sftp-key-file', '--sftp-remote-path'), _add_sftp_options),
+]
+
+class _ArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser that reports errors with the usage of the full parser."""
+    
+    def error(self, message):
+        # a parser missing the storage groups would leave them out of the usage line
+        full_parser = _build_parser(tuple(range(len(_STORAGE_GROUPS))))
+        if full_parser is not self:
+            full_parser.error(message)
+        super().error(message)
+
+def _mentions_option(argv: List[str], options: Tuple[str, ...]) -> bool:
+    """Check if any token in argv is one of options, or an abbreviation argparse would accept."""
+    for arg in argv:
+        if not arg.startswith('--') or len(arg) <= 2:
+            continue
+        name = arg.split('=', 1)[0]
+        if any(option.startswith(name) for option in options):
+            return True
+    return False
+
+@functools.lru_cache(maxsize=None)
+def _build_parser(storage_groups: Tuple[int, ...]) -> argparse.ArgumentParser:
+    """
+    Build the argument parser with the given entries of _STORAGE_GROUPS.
+    
+    Cached per group combination, parsing doesn't modify the parser so the
+    same instance can serve every parse_args call.
+    """
+    parser = _ArgumentParser(description='Docu Crawler - Web Crawler Library')
+    parser.add_argument('url', nargs='?', help='The starting URL of the documentation')
+    parser.add_argument('--output', help='Output directory for downloaded files (default: downloaded_docs)')
+    parser.add_argument('--delay', type=float, help='Delay between requests in seconds (default: 1.0)')
+    parser.add_argument('--log-level', 
+                        choices=_LOG_LEVELS.keys(),
+                        help='Set the logging level (default: INFO)')
+    parser.add_argument('--max-pages', type=int, 
+                        help='Maximum number of pages to download (0 for unlimited, default: 0)')
+    parser.add_argument('--timeout', type=int,
+                        help='Request timeout in seconds (default: 10)')
+    parser.add_argument('--single-file', action='store_true',
+                        help='Combine all crawled pages into a single Markdown file (default: False)')
+    parser.add_argument('--frontmatter', action='store_true',
+                        help='Add YAML frontmatter to Markdown files (default: False)')
+    
+    # keep the namespace the same whether or not the storage groups get built
+    parser.set_defaults(storage_type='local', use_gcs=False, bucket=None, project=None,
+                        credentials=None, s3_bucket=None, s3_region=None, s3_endpoint_url=None,
+                        azure_container=None, azure_connection_string=None,
+                        sftp_host=None, sftp_user=None, sftp_password=None, sftp_port=22,
+                        sftp_key_file=None, sftp_remote_path=None)
+    
+    for index in storage_groups:
+        _STORAGE_GROUPS[index][1](parser)
     
     config_group = parser.add_argument_group('Configuration options')
     config_group.add_argument('--config', 
                               help='Path to configuration file (default: searches in standard locations)')
     
-    return parser.parse_args()
+    return parser
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments for the crawler.
+    
+    Args:
+        argv: Arguments to parse (defaults to sys.argv[1:])
+    
+    Returns:
+        Namespace containing the parsed arguments
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    wants_help = '-h' in argv or _mentions_option(argv, ('--help',))
+    storage_groups = tuple(index for index, (options, _) in enumerate(_STORAGE_GROUPS)
+                           if wants_help or _mentions_option(argv, options))
+    
+    return _build_parser(storage_groups).parse_args(argv)
 
 def get_log_level(level_name: str) -> int:
     """
@@ -88,7 +158,11 @@ def get_log_level(level_name: str) -> int:
     Raises:
         AttributeError: If the log level name is invalid
     """
-    level = getattr(logging, level_name.upper(), None)
+    name = level_name.upper()
+    level = _LOG_LEVELS.get(name)
+    if level is None:
+        # still accept the other names logging knows about (WARN, FATAL, ...)
+        level = getattr(logging, name, None)
     if level is None:
         raise AttributeError(f"Invalid log level: {level_name}")
     return level
@@ -1,14 +1,21 @@
 import os
+import stat
+import pickle
 import logging
+import tempfile
+import functools
 from typing import Dict, Any, Optional, List
 
 logger = logging.getLogger('DocuCrawler')
 
-try:
-    import yaml
-    YAML_AVAILABLE = True
-except ImportError:
-    YAML_AVAILABLE = False
+@functools.lru_cache(maxsize=None)
+def _import_yaml():
+    """Import pyyaml on first use, returns None if it isn't installed."""
+    try:
+        import yaml
+        return yaml
+    except ImportError:
+        return None
 
 DEFAULT_CONFIG_PATHS = [
     './crawler_config.yaml',
@@ -23,13 +30,70 @@ DEFAULT_CREDENTIALS_PATHS = [
     '~/.config/docu-crawler/credentials.json',
 ]
 
+@functools.lru_cache(maxsize=32)
+def _resolve_path(path: str) -> Optional[str]:
+    """
+    Expand a candidate path and check that it exists.
+    
+    Results are memoized since the same default locations are probed on every
+    lookup; call _resolve_path.cache_clear() if files are created or removed
+    while the process is running.
+    """
+    expanded_path = os.path.expanduser(path)
+    if os.path.exists(expanded_path):
+        return expanded_path
+    return None
+
 def find_file(paths: List[str]) -> Optional[str]:
     """Search for a file in multiple locations."""
-    for path in paths:
-        expanded_path = os.path.expanduser(path)
-        if os.path.exists(expanded_path):
-            return expanded_path
-    return None
+    return next((resolved for resolved in map(_resolve_path, paths) if resolved), None)
+
+def _config_cache_path(file_path: str) -> str:
+    return f"{file_path}.cache.pkl"
+
+def _read_config_cache(file_path: str, source_stat: os.stat_result) -> Optional[Dict[str, Any]]:
+    """
+    Return the cached config for file_path if it was written for this version of the file.
+    
+    Unpickling runs code, so the cache is only trusted if it belongs to the
+    current user and nobody else can write it. Otherwise anyone able to drop a
+    file into the working directory could run code as us, which the yaml
+    file alone (parsed with safe_load) never allowed.
+    """
+    try:
+        with open(_config_cache_path(file_path), 'rb') as f:
+            cache_stat = os.fstat(f.fileno())
+            if hasattr(os, 'getuid') and cache_stat.st_uid != os.getuid():
+                return None
+            if cache_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+                return None
+            cached = pickle.load(f)
+    except Exception:
+        return None
+    
+    if (not isinstance(cached, dict) or
+            cached.get('mtime_ns') != source_stat.st_mtime_ns or
+            cached.get('size') != source_stat.st_size or
+            not isinstance(cached.get('config'), dict)):
+        return None
+    return cached['config']
+
+def _write_config_cache(file_path: str, source_stat: os.stat_result, config: Dict[str, Any]) -> None:
+    """Store a parsed config next to its source file (best effort, e.g. /etc is usually read-only)."""
+    cache_path = _config_cache_path(file_path)
+    payload = {'mtime_ns': source_stat.st_mtime_ns, 'size': source_stat.st_size, 'config': config}
+    try:
+        # write to a temp file and rename so concurrent runs never see a partial cache
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+    except Exception as e:
+        logger.debug(f"Could not write config cache {cache_path}: {str(e)}")
 
 def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
     """
@@ -41,10 +105,6 @@ def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
     Returns:
         Dictionary containing configuration, or empty dict if no config found or YAML unavailable.
     """
-    if not YAML_AVAILABLE:
-        logger.warning("pyyaml is not installed. Install with 'pip install docu-crawler[yaml]' to use config files.")
-        return {}
-    
     if config_path:
         if not os.path.exists(config_path):
             logger.warning(f"Config file not found: {config_path}")
@@ -57,6 +117,23 @@ def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
         logger.debug("No config file found. Using default configuration.")
         return {}
     
+    # a cache written for the same mtime and size skips both the yaml import and the parse
+    try:
+        source_stat = os.stat(file_path)
+    except OSError:
+        source_stat = None
+    if source_stat is not None:
+        cached = _read_config_cache(file_path, source_stat)
+        if cached is not None:
+            logger.info(f"Loaded configuration from {file_path}")
+            return cached
+    
+    # only pay for the yaml import when there's actually a file to parse
+    yaml = _import_yaml()
+    if yaml is None:
+        logger.warning("pyyaml is not installed. Install with 'pip install docu-crawler[yaml]' to use config files.")
+        return {}
+    
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             config = yaml.safe_load(f)
@@ -65,6 +142,8 @@ def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
             logger.warning(f"Invalid config format in {file_path}. Using default configuration.")
             return {}
             
+        if source_stat is not None:
+            _write_config_cache(file_path, source_stat, config)
         logger.info(f"Loaded configuration from {file_path}")
         return config
     except Exception as e:
@@ -1,24 +1,46 @@
+import queue
+import atexit
 import logging
+import logging.handlers
+
+# background thread that owns the real handlers once setup_logger has run
+_listener = None
 
 def setup_logger(log_file="doc_crawler.log", log_level=logging.INFO):
     """
     Set up and configure the logger for the application.
-    
+
+    Log calls only put records on a queue; a single listener thread does the
+    file and console writes, so crawler threads never block on log I/O.
+
     Args:
         log_file: Path to the log file
         log_level: Logging level (e.g., logging.INFO, logging.DEBUG)
-        
+
     Returns:
         Configured logger instance
     """
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
-    )
-    
+    global _listener
+
+    # like basicConfig, leave an already configured root logger alone
+    if _listener is None and not logging.getLogger().handlers:
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setFormatter(formatter)
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+
+        log_queue = queue.Queue(-1)
+        _listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler,
+                                                   respect_handler_level=True)
+        _listener.start()
+        # flush whatever is still queued when the process exits
+        atexit.register(_listener.stop)
+
+        # the listener's handlers apply the real format, only merge the args here
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        logging.basicConfig(level=log_level, handlers=[queue_handler])
+
     logger = logging.getLogger('DocuCrawler')
     return logger
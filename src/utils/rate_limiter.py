@@ -1,18 +1,23 @@
 import time
 import logging
-from typing import Dict, Optional
-from collections import defaultdict
+from typing import Optional, Tuple
+from collections import OrderedDict
 from threading import Lock
 
 logger = logging.getLogger('DocuCrawler')
 
+# per-key state kept for at most this many domains, the least recently used
+# ones are dropped (by then their delay has long passed)
+MAX_TRACKED_KEYS = 4096
+
 class RateLimiter:
     """
     Rate limiter using token bucket algorithm.
     Supports per-domain rate limiting.
     """
     
-    def __init__(self, rate: float = 1.0, per: float = 1.0, per_domain: bool = True):
+    def __init__(self, rate: float = 1.0, per: float = 1.0, per_domain: bool = True,
+                 max_keys: int = MAX_TRACKED_KEYS):
         """
         Initialize rate limiter.
         
@@ -20,12 +25,14 @@ class RateLimiter:
             rate: Number of requests allowed
             per: Time period in seconds
             per_domain: Whether to limit per domain or globally
+            max_keys: Maximum number of domains to keep bucket state for
         """
         self.rate = rate
         self.per = per
         self.per_domain = per_domain
-        self.tokens: Dict[str, float] = defaultdict(lambda: rate)
-        self.last_update: Dict[str, float] = defaultdict(lambda: time.time())
+        self.max_keys = max_keys
+        # key -> (tokens, last update), in least recently used order
+        self.buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
         self.lock = Lock()
     
     def wait_if_needed(self, domain: Optional[str] = None) -> None:
@@ -36,41 +43,44 @@ class RateLimiter:
             domain: Domain name for per-domain limiting (optional)
         """
         key = domain if self.per_domain and domain else 'global'
+        rate = self.rate
+        per = self.per
         
+        # take the token under the lock (it may go negative, which reserves a
+        # future slot) and do the sleeping outside so other keys aren't blocked
         with self.lock:
-            now = time.time()
-            elapsed = now - self.last_update[key]
-            
-            tokens_to_add = (elapsed / self.per) * self.rate
-            self.tokens[key] = min(self.tokens[key] + tokens_to_add, self.rate)
-            self.last_update[key] = now
+            now = time.monotonic()
+            tokens, last_update = self.buckets.get(key, (rate, now))
             
-            if self.tokens[key] < 1.0:
-                wait_time = (1.0 - self.tokens[key]) * (self.per / self.rate)
-                logger.debug(f"Rate limit reached for {key}, waiting {wait_time:.2f}s")
-                time.sleep(wait_time)
-                now = time.time()
-                elapsed = now - self.last_update[key]
-                tokens_to_add = (elapsed / self.per) * self.rate
-                self.tokens[key] = min(self.tokens[key] + tokens_to_add, self.rate)
-                self.last_update[key] = now
-            
-            self.tokens[key] -= 1.0
+            tokens = min(tokens + ((now - last_update) / per) * rate, rate)
+            self.buckets[key] = (tokens - 1.0, now)
+            self.buckets.move_to_end(key)
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        
+        if tokens < 1.0:
+            wait_time = (1.0 - tokens) * (per / rate)
+            logger.debug("Rate limit reached for %s, waiting %.2fs", key, wait_time)
+            time.sleep(wait_time)
 
 class SimpleRateLimiter:
     """
     Simple rate limiter that just enforces a delay between requests.
     """
     
-    def __init__(self, delay: float = 1.0):
+    def __init__(self, delay: float = 1.0, max_keys: int = MAX_TRACKED_KEYS):
         """
         Initialize simple rate limiter.
         
         Args:
             delay: Delay in seconds between requests
+            max_keys: Maximum number of domains to keep timing state for
         """
         self.delay = delay
-        self.last_request_time: Dict[str, float] = {}
+        self.max_keys = max_keys
+        # monotonic time before which the next request for a key may not start,
+        # in least recently used order
+        self.next_allowed_time: "OrderedDict[str, float]" = OrderedDict()
         self.lock = Lock()
     
     def wait_if_needed(self, domain: Optional[str] = None) -> None:
@@ -82,14 +92,17 @@ class SimpleRateLimiter:
         """
         key = domain or 'global'
         
+        # only the slot reservation needs the lock, sleeping while holding it
+        # would stall every other domain too
         with self.lock:
-            now = time.time()
-            if key in self.last_request_time:
-                elapsed = now - self.last_request_time[key]
-                if elapsed < self.delay:
-                    wait_time = self.delay - elapsed
-                    logger.debug(f"Rate limiting: waiting {wait_time:.2f}s")
-                    time.sleep(wait_time)
-            
-            self.last_request_time[key] = time.time()
-
+            now = time.monotonic()
+            start = max(now, self.next_allowed_time.get(key, now))
+            self.next_allowed_time[key] = start + self.delay
+            self.next_allowed_time.move_to_end(key)
+            if len(self.next_allowed_time) > self.max_keys:
+                self.next_allowed_time.popitem(last=False)
+        
+        wait_time = start - now
+        if wait_time > 0:
+            logger.debug("Rate limiting: waiting %.2fs", wait_time)
+            time.sleep(wait_time)
@@ -1,6 +1,8 @@
 import time
+import asyncio
+import inspect
 import logging
-from typing import Callable, TypeVar, Optional
+from typing import Callable, TypeVar, Optional, Any
 from functools import wraps
 
 logger = logging.getLogger('DocuCrawler')
@@ -17,6 +19,9 @@ def retry_with_backoff(
     """
     Decorator for retrying functions with exponential backoff.
     
+    Works on both regular and async functions; async functions back off with
+    asyncio.sleep so the event loop keeps serving other requests.
+    
     Args:
         max_retries: Maximum number of retry attempts
         initial_delay: Initial delay in seconds
@@ -24,31 +29,51 @@ def retry_with_backoff(
         max_delay: Maximum delay in seconds
         retry_on: Tuple of exception types to retry on (default: all exceptions)
     """
+    def should_retry(func: Callable, e: Exception, attempt: int, delay: float) -> bool:
+        if retry_on and not isinstance(e, retry_on):
+            return False
+        
+        if attempt < max_retries:
+            logger.warning(
+                "Attempt %d/%d failed for %s: %s. Retrying in %.1fs...",
+                attempt + 1, max_retries + 1, func.__name__, e, delay
+            )
+            return True
+        
+        logger.error("All %d attempts failed for %s", max_retries + 1, func.__name__)
+        return False
+    
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> T:
+                delay = initial_delay
+                
+                for attempt in range(max_retries + 1):
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception as e:
+                        if not should_retry(func, e, attempt, delay):
+                            raise
+                        await asyncio.sleep(delay)
+                        delay = min(delay * backoff_factor, max_delay)
+                
+                raise RuntimeError("Unexpected error in retry decorator")
+            
+            return async_wrapper
+        
         @wraps(func)
         def wrapper(*args, **kwargs) -> T:
             delay = initial_delay
-            last_exception = None
             
             for attempt in range(max_retries + 1):
                 try:
                     return func(*args, **kwargs)
                 except Exception as e:
-                    last_exception = e
-                    
-                    if retry_on and not isinstance(e, retry_on):
+                    if not should_retry(func, e, attempt, delay):
                         raise
-                    
-                    if attempt < max_retries:
-                        logger.warning(
-                            f"Attempt {attempt + 1}/{max_retries + 1} failed for {func.__name__}: {str(e)}. "
-                            f"Retrying in {delay:.1f}s..."
-                        )
-                        time.sleep(delay)
-                        delay = min(delay * backoff_factor, max_delay)
-                    else:
-                        logger.error(f"All {max_retries + 1} attempts failed for {func.__name__}")
-                        raise last_exception
+                    time.sleep(delay)
+                    delay = min(delay * backoff_factor, max_delay)
             
             # should never get here but type checkers need this
             raise RuntimeError("Unexpected error in retry decorator")
@@ -56,6 +81,16 @@ def retry_with_backoff(
         return wrapper
     return decorator
 
+def _retry_after_seconds(result: Any) -> Optional[float]:
+    """Parse a numeric Retry-After header, None if it's missing or not a number."""
+    retry_after = result.headers.get('Retry-After')
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        return None
+
 def retry_on_http_error(
     max_retries: int = 3,
     retry_status_codes: tuple = (500, 502, 503, 504, 429),
@@ -65,13 +100,69 @@ def retry_on_http_error(
     """
     Retry function specifically for HTTP requests.
     
+    Works on both regular and async functions; async functions back off with
+    asyncio.sleep so the event loop keeps serving other requests.
+    
     Args:
         max_retries: Maximum number of retry attempts
         retry_status_codes: HTTP status codes to retry on
         initial_delay: Initial delay in seconds
         backoff_factor: Factor to multiply delay by on each retry
     """
+    retry_status_codes = frozenset(retry_status_codes)
+    
+    def status_delay(result: Any, attempt: int, delay: float) -> Optional[float]:
+        """Return how long to wait before retrying a retryable result, or None to return it."""
+        if attempt >= max_retries:
+            return None
+        status_code = result.status_code
+        
+        retry_after = _retry_after_seconds(result)
+        if retry_after is not None:
+            delay = retry_after
+        
+        logger.warning(
+            "HTTP %s error on attempt %d/%d. Retrying in %.1fs...",
+            status_code, attempt + 1, max_retries + 1, delay
+        )
+        return delay
+    
+    def log_exception(e: Exception, attempt: int, delay: float) -> None:
+        logger.warning(
+            "Attempt %d/%d failed: %s. Retrying in %.1fs...",
+            attempt + 1, max_retries + 1, e, delay
+        )
+    
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> T:
+                delay = initial_delay
+                
+                for attempt in range(max_retries + 1):
+                    try:
+                        result = await func(*args, **kwargs)
+                    except Exception as e:
+                        if attempt >= max_retries:
+                            raise
+                        log_exception(e, attempt, delay)
+                        await asyncio.sleep(delay)
+                        delay = min(delay * backoff_factor, 60.0)
+                        continue
+                    
+                    # most responses aren't retryable, return those before any other work
+                    if getattr(result, 'status_code', None) not in retry_status_codes:
+                        return result
+                    wait = status_delay(result, attempt, delay)
+                    if wait is None:
+                        return result
+                    await asyncio.sleep(wait)
+                    delay = min(wait * backoff_factor, 60.0)
+                
+                raise RuntimeError("Unexpected error in retry decorator")
+            
+            return async_wrapper
+        
         @wraps(func)
         def wrapper(*args, **kwargs) -> T:
             delay = initial_delay
@@ -79,37 +170,29 @@ def retry_on_http_error(
             for attempt in range(max_retries + 1):
                 try:
                     result = func(*args, **kwargs)
-                    if hasattr(result, 'status_code'):
-                        if result.status_code in retry_status_codes:
-                            if attempt < max_retries:
-                                retry_after = result.headers.get('Retry-After')
-                                if retry_after:
-                                    try:
-                                        delay = float(retry_after)
-                                    except ValueError:
-                                        pass
-                                
-                                logger.warning(
-                                    f"HTTP {result.status_code} error on attempt {attempt + 1}/{max_retries + 1}. "
-                                    f"Retrying in {delay:.1f}s..."
-                                )
-                                time.sleep(delay)
-                                delay = min(delay * backoff_factor, 60.0)
-                                continue
-                    return result
                 except Exception as e:
-                    if attempt < max_retries:
-                        logger.warning(
-                            f"Attempt {attempt + 1}/{max_retries + 1} failed: {str(e)}. "
-                            f"Retrying in {delay:.1f}s..."
-                        )
-                        time.sleep(delay)
-                        delay = min(delay * backoff_factor, 60.0)
-                    else:
+                    if attempt >= max_retries:
                         raise
+                    log_exception(e, attempt, delay)
+                    time.sleep(delay)
+                    delay = min(delay * backoff_factor, 60.0)
+                    continue
+                
+                # most responses aren't retryable, return those before any other work
+                if getattr(result, 'status_code', None) not in retry_status_codes:
+                    return result
+                wait = status_delay(result, attempt, delay)
+                if wait is None:
+                    return result
+                time.sleep(wait)
+                delay = min(wait * backoff_factor, 60.0)
             
             raise RuntimeError("Unexpected error in retry decorator")
         
         return wrapper
     return decorator
 
+# explicit names for async call sites, the decorators above already dispatch
+# on whether the wrapped function is a coroutine function
+async_retry_with_backoff = retry_with_backoff
+async_retry_on_http_error = retry_on_http_error
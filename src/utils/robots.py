@@ -1,93 +1,273 @@
+import os
+import re
+import pickle
+import functools
+import hashlib
 import logging
+import tempfile
 from urllib.robotparser import RobotFileParser
-from urllib.parse import urlparse
-from typing import Dict, Optional, List
+from urllib.parse import urlparse, urlunparse, unquote, quote
+from typing import Dict, Optional, List, Pattern, Tuple, Union
 import time
 import requests
+from requests.adapters import HTTPAdapter
+
+from .url_utils import cached_urlparse
 
 logger = logging.getLogger('DocuCrawler')
 
 DEFAULT_CACHE_DURATION = 3600
+# parsed robots.txt files are kept here between runs
+DEFAULT_ROBOTS_CACHE_DIR = '~/.cache/docu-crawler/robots'
+
+# robots.txt is one small request per domain, so keep a connection per host around
+POOL_CONNECTIONS = 64
 
 # http status codes
 HTTP_OK = 200
+HTTP_NOT_MODIFIED = 304
 HTTP_UNAUTHORIZED = 401
 HTTP_FORBIDDEN = 403
 
+# robots.txt only governs http(s) urls, everything else is answered by this
+_PERMISSIVE_PARSER = RobotFileParser()
+_PERMISSIVE_PARSER.allow_all = True
+
+def _compile_rules(parser: RobotFileParser, user_agent: str) -> Union[bool, Pattern]:
+    """
+    Compile the rules RobotFileParser would apply to user_agent into one regex.
+    
+    The parser takes the first rule whose path is a prefix of the url, which is
+    exactly what an ordered alternation of escaped prefixes does in a single
+    match call. Group names record the rule type ('a' allow, 'd' disallow).
+    
+    Args:
+        parser: Parsed robots.txt
+        user_agent: User agent string
+        
+    Returns:
+        True/False when the answer doesn't depend on the path, otherwise a
+        compiled pattern
+    """
+    if parser.disallow_all:
+        return False
+    if parser.allow_all:
+        return True
+    # same as RobotFileParser, nothing is allowed until robots.txt was parsed
+    if not parser.last_checked:
+        return False
+    
+    entry = next((e for e in parser.entries if e.applies_to(user_agent)), parser.default_entry)
+    if entry is None or not entry.rulelines:
+        return True
+    
+    alternatives = []
+    for i, line in enumerate(entry.rulelines):
+        prefix = '' if line.path == '*' else re.escape(line.path)
+        alternatives.append(f"(?P<{'a' if line.allowance else 'd'}{i}>{prefix})")
+    return re.compile('|'.join(alternatives))
+
+@functools.lru_cache(maxsize=4096)
+def _get_origin(url: str) -> str:
+    """Get scheme://netloc for a url, robots.txt rules are scoped to it."""
+    parsed = cached_urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+@functools.lru_cache(maxsize=4096)
+def _robots_path(url: str) -> str:
+    """Normalize a url to the path form RobotFileParser matches rules against."""
+    parsed_url = urlparse(unquote(url))
+    path = quote(urlunparse(('', '', parsed_url.path, parsed_url.params, parsed_url.query, parsed_url.fragment)))
+    return path or '/'
+
+def _is_allowed(matcher: Union[bool, Pattern], url: str) -> bool:
+    """Apply compiled rules from _compile_rules to a url."""
+    if isinstance(matcher, bool):
+        return matcher
+    match = matcher.match(_robots_path(url))
+    return match is None or match.lastgroup[0] == 'a'
+
 class RobotsTxtChecker:
     """
     Check and respect robots.txt files.
     """
     
-    def __init__(self, headers: Optional[Dict[str, str]] = None, timeout: int = 10):
+    def __init__(self, headers: Optional[Dict[str, str]] = None, timeout: int = 10,
+                 session: Optional[requests.Session] = None,
+                 cache_dir: Optional[str] = DEFAULT_ROBOTS_CACHE_DIR):
         """
         Initialize robots.txt checker.
         
         Args:
             headers: Headers to use for fetching robots.txt (e.g. User-Agent)
             timeout: Timeout in seconds for fetching robots.txt
+            session: Optional requests session to use for fetching
+            cache_dir: Directory to persist parsed robots.txt files across runs
+                      (None keeps the cache in memory only)
         """
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_CONNECTIONS)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
         self.parsers: Dict[str, RobotFileParser] = {}
+        # compiled rules per (domain, user agent), dropped when the parser is replaced
+        self.matchers: Dict[Tuple[str, str], Union[bool, Pattern]] = {}
         self.cache_time: Dict[str, float] = {}
+        # ETag / Last-Modified of each domain's robots.txt, sent back on refresh
+        self.validators: Dict[str, Dict[str, str]] = {}
         self.cache_duration = DEFAULT_CACHE_DURATION
         self.headers = headers or {'User-Agent': '*'}
         self.timeout = timeout
     
     def _get_domain(self, url: str) -> str:
         """Extract domain from URL."""
-        parsed = urlparse(url)
-        return f"{parsed.scheme}://{parsed.netloc}"
+        return _get_origin(url)
     
     def _get_robots_url(self, url: str) -> str:
         """Get robots.txt URL for a given URL."""
         domain = self._get_domain(url)
         return f"{domain}/robots.txt"
     
+    def _cache_path(self, domain: str) -> str:
+        """Get the on-disk cache file for a domain."""
+        name = hashlib.sha1(domain.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.pkl")
+    
+    def _load_cached(self, domain: str) -> None:
+        """Populate the in-memory cache for a domain from disk, if a cache file exists."""
+        try:
+            with open(self._cache_path(domain), 'rb') as f:
+                cached = pickle.load(f)
+            parser = cached['parser']
+            fetch_time = float(cached['fetch_time'])
+            validators = dict(cached['validators'])
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.debug("Ignoring unreadable robots.txt cache for %s: %s", domain, e)
+            return
+        
+        if not isinstance(parser, RobotFileParser):
+            return
+        self.parsers[domain] = parser
+        self.cache_time[domain] = fetch_time
+        self.validators[domain] = validators
+    
+    def _save_cached(self, domain: str) -> None:
+        """Write a domain's parser to disk (best effort)."""
+        payload = {
+            'fetch_time': self.cache_time[domain],
+            'validators': self.validators.get(domain, {}),
+            'parser': self.parsers[domain],
+        }
+        cache_path = self._cache_path(domain)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # write to a temp file and rename so concurrent crawls never read a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+        except Exception as e:
+            logger.debug("Could not write robots.txt cache %s: %s", cache_path, e)
+    
     def _get_parser(self, url: str) -> RobotFileParser:
         """Get or create RobotFileParser for a domain."""
+        parsed = cached_urlparse(url)
+        if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+            # nothing to fetch for mailto:, file:, relative or malformed urls
+            return _PERMISSIVE_PARSER
+        
         domain = self._get_domain(url)
         
+        if domain not in self.parsers and self.cache_dir:
+            self._load_cached(domain)
+        
         if domain in self.parsers:
             cache_age = time.time() - self.cache_time.get(domain, 0)
             if cache_age < self.cache_duration:
                 return self.parsers[domain]
         
         robots_url = self._get_robots_url(url)
+        cached_parser = self.parsers.get(domain)
         parser = RobotFileParser()
         parser.set_url(robots_url)
         
+        fetched = False
+        request_headers = dict(self.headers)
+        if cached_parser is not None:
+            request_headers.update(self.validators.get(domain, {}))
+        
         try:
             # fetch robots.txt using requests so we can control timeouts and headers
-            response = requests.get(robots_url, headers=self.headers, timeout=self.timeout)
+            response = self.session.get(robots_url, headers=request_headers, timeout=self.timeout)
+            
+            if response.status_code == HTTP_NOT_MODIFIED and cached_parser is not None:
+                # unchanged since last time, keep the parser (and compiled rules) we have
+                logger.debug("robots.txt at %s not modified", robots_url)
+                self.cache_time[domain] = time.time()
+                if self.cache_dir:
+                    self._save_cached(domain)
+                return cached_parser
             
             if response.status_code in (HTTP_UNAUTHORIZED, HTTP_FORBIDDEN):
                 # can't read robots.txt so just allow everything. be nice, not strict.
-                logger.warning(f"Access denied for robots.txt at {robots_url} ({response.status_code})")
+                logger.warning("Access denied for robots.txt at %s (%s)", robots_url, response.status_code)
                 
             elif response.status_code == HTTP_OK:
-                # try utf-8, latin-1 if that doesn't work
+                # decode the raw bytes ourselves, response.text would run charset
+                # detection. robots.txt should be utf-8, latin-1 maps any byte so
+                # it can't fail as the fallback
                 try:
                     content_text = response.content.decode('utf-8')
                 except UnicodeDecodeError:
-                    try:
-                        content_text = response.content.decode('latin-1')
-                    except UnicodeDecodeError:
-                        logger.warning(f"Could not decode robots.txt content from {robots_url}")
-                        content_text = ''
+                    content_text = response.content.decode('latin-1')
                 
                 lines = content_text.splitlines()
                 parser.parse(lines)
-                logger.debug(f"Loaded robots.txt from {robots_url}")
+                
+                validators = {}
+                if response.headers.get('ETag'):
+                    validators['If-None-Match'] = response.headers['ETag']
+                if response.headers.get('Last-Modified'):
+                    validators['If-Modified-Since'] = response.headers['Last-Modified']
+                self.validators[domain] = validators
+                fetched = True
+                logger.debug("Loaded robots.txt from %s", robots_url)
                 
         except Exception as e:
-            logger.warning(f"Could not load robots.txt from {robots_url}: {str(e)}")
+            logger.warning("Could not load robots.txt from %s: %s", robots_url, e)
             # default to allowing everything if we can't read robots.txt
         
         self.parsers[domain] = parser
         self.cache_time[domain] = time.time()
+        # other threads may add matchers meanwhile, so walk a snapshot
+        for key in list(self.matchers):
+            if key[0] == domain:
+                self.matchers.pop(key, None)
+        # only persist real robots.txt files, not fallbacks from failed fetches
+        if fetched and self.cache_dir:
+            self._save_cached(domain)
         
         return parser
     
+    def _get_matcher(self, url: str, user_agent: str) -> Union[bool, Pattern]:
+        """Get or compile the rules that apply to user_agent on url's domain."""
+        parser = self._get_parser(url)
+        key = (self._get_domain(url), user_agent)
+        matcher = self.matchers.get(key)
+        if matcher is None:
+            matcher = _compile_rules(parser, user_agent)
+            self.matchers[key] = matcher
+        return matcher
+    
     def can_fetch(self, url: str, user_agent: str = '*') -> bool:
         """
         Check if a URL can be fetched according to robots.txt.
@@ -100,20 +280,48 @@ class RobotsTxtChecker:
             True if URL can be fetched, False otherwise
         """
         try:
-            parser = self._get_parser(url)
-            parsed_url = urlparse(url)
-            path = parsed_url.path or '/'
-            
-            can_fetch = parser.can_fetch(user_agent, url)
+            can_fetch = _is_allowed(self._get_matcher(url, user_agent), url)
             
             if not can_fetch:
-                logger.debug(f"robots.txt disallows fetching: {url}")
+                logger.debug("robots.txt disallows fetching: %s", url)
             
             return can_fetch
         except Exception as e:
-            logger.warning(f"Error checking robots.txt for {url}: {str(e)}")
+            logger.warning("Error checking robots.txt for %s: %s", url, e)
             return True
     
+    def can_fetch_many(self, urls: List[str], user_agent: str = '*') -> List[bool]:
+        """
+        Check a batch of URLs, looking up each domain's rules only once.
+        
+        Args:
+            urls: URLs to check
+            user_agent: User agent string (default: '*')
+            
+        Returns:
+            List of booleans in the same order as urls
+        """
+        results = []
+        matchers: Dict[str, Union[bool, Pattern]] = {}
+        
+        for url in urls:
+            try:
+                domain = self._get_domain(url)
+                matcher = matchers.get(domain)
+                if matcher is None:
+                    matcher = self._get_matcher(url, user_agent)
+                    matchers[domain] = matcher
+                can_fetch = _is_allowed(matcher, url)
+            except Exception as e:
+                logger.warning("Error checking robots.txt for %s: %s", url, e)
+                can_fetch = True
+            
+            if not can_fetch:
+                logger.debug("robots.txt disallows fetching: %s", url)
+            results.append(can_fetch)
+        
+        return results
+    
     def get_crawl_delay(self, url: str, user_agent: str = '*') -> Optional[float]:
         """
         Get crawl delay from robots.txt.
@@ -129,9 +337,9 @@ class RobotsTxtChecker:
             parser = self._get_parser(url)
             delay = parser.crawl_delay(user_agent)
             if delay:
-                logger.debug(f"robots.txt specifies crawl delay of {delay}s for {url}")
+                logger.debug("robots.txt specifies crawl delay of %ss for %s", delay, url)
             return delay
         except Exception as e:
-            logger.warning(f"Error getting crawl delay for {url}: {str(e)}")
+            logger.warning("Error getting crawl delay for %s: %s", url, e)
             return None
 
@@ -1,36 +1,178 @@
+import time
+import zlib
 import logging
-import xml.etree.ElementTree as ET
-from typing import List, Set, Optional
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from xml.parsers import expat
+from typing import Dict, List, Set, Optional, Iterable, Iterator, Tuple, Protocol
 from urllib.parse import urlparse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger('DocuCrawler')
 
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+# namespaced or bare <loc> as expat names them, but not e.g. <image:loc>
+_LOC_TAGS = frozenset((f'{SITEMAP_NS}}}loc', 'loc'))
+STREAM_CHUNK_SIZE = 64 * 1024
+# concurrent sub-sitemap downloads for a sitemap index
+MAX_SITEMAP_WORKERS = 16
+GZIP_MAGIC = b'\x1f\x8b'
+# how long fetched sitemaps are reused for, in seconds
+DEFAULT_CACHE_DURATION = 3600
+
+class VisitedSet(Protocol):
+    """
+    What fetch_urls needs from its `visited` argument.
+    
+    A plain set works. For very large cross-domain sweeps a bloom filter
+    (e.g. pybloom_live.ScalableBloomFilter) can be passed instead, trading a
+    small chance of skipping an unseen sitemap for far less memory.
+    """
+    
+    def __contains__(self, item: str) -> bool: ...
+    
+    def add(self, item: str) -> None: ...
+
+def _gunzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Pass chunks through, decompressing them on the fly if the body is gzip.
+    
+    sitemap.xml.gz files are usually served as the compressed bytes themselves
+    (not with Content-Encoding, which requests would already undo), so sniff
+    the gzip magic number rather than trusting the url or Content-Type.
+    
+    Args:
+        chunks: The response body as an iterable of byte chunks
+        
+    Yields:
+        Chunks of the (decompressed) document
+    """
+    chunks = iter(chunks)
+    head = b''
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= 2:
+            break
+    
+    if not head.startswith(GZIP_MAGIC):
+        yield head
+        yield from chunks
+        return
+    
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for chunk in itertools.chain((head,), chunks):
+        data = decompressor.decompress(chunk)
+        if data:
+            yield data
+    data = decompressor.flush()
+    if data:
+        yield data
+
+def _iter_sitemap(chunks: Iterable[bytes]) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Stream <loc> values out of a sitemap document as it is read.
+    
+    Uses the expat push parser directly, so no elements are ever built and
+    memory stays flat however large the sitemap is.
+    
+    Args:
+        chunks: The document as an iterable of byte chunks
+        
+    Yields:
+        (root element name, None) once the root element is known, then
+        (root element name, loc) for every loc in the document
+    """
+    parser = expat.ParserCreate(namespace_separator='}')
+    parser.buffer_text = True
+    # locs (None for the root) seen while parsing the current chunk
+    found: List[Optional[str]] = []
+    text: Optional[List[str]] = None
+    root_name = ''
+    
+    def start_element(name, attrs):
+        nonlocal text, root_name
+        if not root_name:
+            root_name = name.rsplit('}', 1)[-1]
+            found.append(None)
+        elif name in _LOC_TAGS:
+            text = []
+    
+    def character_data(data):
+        if text is not None:
+            text.append(data)
+    
+    def end_element(name):
+        nonlocal text
+        if text is not None and name in _LOC_TAGS:
+            found.append(''.join(text))
+            text = None
+    
+    parser.StartElementHandler = start_element
+    parser.CharacterDataHandler = character_data
+    parser.EndElementHandler = end_element
+    
+    # a trailing None finishes the parse, which raises on truncated documents
+    for chunk in itertools.chain(chunks, [None]):
+        if chunk is None:
+            parser.Parse(b'', True)
+        elif chunk:
+            parser.Parse(chunk, False)
+        
+        for loc in found:
+            if loc is None:
+                yield root_name, None
+            elif loc:
+                yield root_name, loc.strip()
+        found.clear()
+
 class SitemapParser:
     """
     Parser for XML sitemaps to extract URLs for crawling.
     """
     
-    def __init__(self, session: Optional[requests.Session] = None):
+    def __init__(self, session: Optional[requests.Session] = None,
+                 cache_duration: float = DEFAULT_CACHE_DURATION):
         """
         Initialize sitemap parser.
         
         Args:
             session: Optional requests session to use for fetching
+            cache_duration: Seconds to reuse a fetched sitemap's urls for
+                            (0 disables the cache)
         """
-        self.session = session or requests.Session()
-        self.namespaces = {
-            'sitemap': 'http://www.sitemaps.org/schemas/sitemap/0.9'
-        }
+        if session is None:
+            # enough pooled connections for the parallel sub-sitemap fetches, and
+            # transient gateway errors are retried at the connection level. a
+            # session passed in by the caller is used as configured
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=32,
+                pool_maxsize=64,
+                max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+        # sub-sitemaps are fetched from worker threads that share `visited`
+        self._visited_lock = threading.Lock()
+        self.cache_duration = cache_duration
+        # sitemap url -> (monotonic fetch time, urls), shared sitemaps of
+        # several indexes or repeated crawls are only downloaded once
+        self._cache: Dict[str, Tuple[float, List[str]]] = {}
+        self._cache_lock = threading.Lock()
         
-    def fetch_urls(self, sitemap_url: str, visited: Optional[Set[str]] = None, max_depth: int = 10) -> List[str]:
+    def fetch_urls(self, sitemap_url: str, visited: Optional[VisitedSet] = None, max_depth: int = 10) -> List[str]:
         """
         Fetch and parse a sitemap to extract all URLs.
         Handles nested sitemaps (sitemapindex).
         
         Args:
             sitemap_url: URL of the sitemap.xml
-            visited: Set of already visited sitemap URLs (to prevent infinite recursion)
+            visited: Already visited sitemap URLs (to prevent infinite recursion), a
+                     set or anything else implementing VisitedSet
             max_depth: Maximum depth for nested sitemaps (default: 10)
             
         Returns:
@@ -38,84 +180,124 @@ class SitemapParser:
         """
         if visited is None:
             visited = set()
+        return self._fetch(sitemap_url, visited, max_depth, parallel=True)[0]
+    
+    def _fetch(self, sitemap_url: str, visited: VisitedSet, max_depth: int, parallel: bool) -> Tuple[List[str], bool]:
+        """
+        fetch_urls for one sitemap of a tree.
+        
+        Args:
+            parallel: Whether this sitemap's sub-sitemaps may be fetched in
+                      parallel, only one level of a tree fans out so nested
+                      indexes don't multiply the threads
+        
+        Returns:
+            (urls, whether every sitemap below sitemap_url was read), only
+            complete results are cached
+        """
+        if self.cache_duration > 0:
+            with self._cache_lock:
+                cached = self._cache.get(sitemap_url)
+            if cached is not None and time.monotonic() - cached[0] < self.cache_duration:
+                logger.debug(f"Using cached sitemap: {sitemap_url}")
+                return list(cached[1]), True
         
         if max_depth <= 0:
             logger.warning(f"Maximum sitemap depth reached for {sitemap_url} (sitemap inception detected)")
-            return []
+            return [], False
         
-        if sitemap_url in visited:
+        with self._visited_lock:
+            already_visited = sitemap_url in visited
+            visited.add(sitemap_url)
+        if already_visited:
             logger.warning(f"Circular reference detected in sitemap: {sitemap_url} (sitemaps referencing themselves - classic)")
-            return []
+            return [], True
         
-        visited.add(sitemap_url)
         urls: Set[str] = set()
+        complete = True
         
         try:
             logger.info(f"Fetching sitemap: {sitemap_url}")
-            response = self.session.get(sitemap_url, timeout=30)
-            response.raise_for_status()
-            
-            # decode content, utf-8 then latin-1
+            response = self.session.get(sitemap_url, timeout=30, stream=True)
+            sub_sitemaps = []
             try:
-                content_text = response.content.decode('utf-8')
-            except UnicodeDecodeError:
-                try:
-                    content_text = response.content.decode('latin-1')
-                except UnicodeDecodeError:
-                    logger.error(f"Could not decode sitemap content from {sitemap_url}")
-                    return list(urls)
+                response.raise_for_status()
+                
+                # what kind of sitemap is this? the root element tells us as
+                # soon as the first chunk is in
+                locs = _iter_sitemap(_gunzip_chunks(response.iter_content(chunk_size=STREAM_CHUNK_SIZE)))
+                root_name, _ = next(locs, ('', None))
+                # everything after the root marker is a loc, so pick the
+                # destination once and let update/extend drain the stream
+                if root_name == 'urlset':
+                    urls.update(loc for _, loc in locs)
+                elif root_name == 'sitemapindex':
+                    sub_sitemaps.extend(loc for _, loc in locs)
+                else:
+                    logger.warning(f"Unknown sitemap format at {sitemap_url} (not XML, not sitemap index - mystery format)")
+                    complete = False
+            finally:
+                response.close()
             
-            # what kind of sitemap is this?
-            if '<sitemapindex' in content_text:
-                self._parse_index(response.content, urls, visited, max_depth)
-            elif '<urlset' in content_text:
-                self._parse_urlset(response.content, urls)
-            else:
-                logger.warning(f"Unknown sitemap format at {sitemap_url} (not XML, not sitemap index - mystery format)")
+            # recursively fetch sub sitemaps once this connection is released
+            complete = self._fetch_sub_sitemaps(sub_sitemaps, urls, visited, max_depth, parallel) and complete
+            
+            # a failed sub-sitemap should be retried next time, not missed for the whole TTL
+            if complete and self.cache_duration > 0:
+                with self._cache_lock:
+                    self._cache[sitemap_url] = (time.monotonic(), list(urls))
                 
         except Exception as e:
             logger.error(f"Error processing sitemap {sitemap_url}: {str(e)}")
+            complete = False
             
-        return list(urls)
+        return list(urls), complete
 
     def _parse_urlset(self, content: bytes, urls: Set[str]):
         """Parse a standard urlset sitemap."""
         try:
-            root = ET.fromstring(content)
-            # xml namespaces. some sitemaps use them, some don't.
-            ns = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-            
-            # check for namespace first
-            locs = root.findall('.//ns:loc', ns)
-            if not locs:
-                # no namespace found, try without it
-                locs = root.findall('.//loc')
-                
-            for loc in locs:
-                if loc.text:
-                    url = loc.text.strip()
-                    urls.add(url)
-                    
-        except ET.ParseError as e:
+            urls.update(loc for _, loc in _iter_sitemap([content]) if loc is not None)
+        except expat.ExpatError as e:
             logger.error(f"XML parse error in urlset: {e}")
 
-    def _parse_index(self, content: bytes, urls: Set[str], visited: Set[str], max_depth: int):
+    def _parse_index(self, content: bytes, urls: Set[str], visited: VisitedSet, max_depth: int):
         """Parse a sitemap index (nested sitemaps)."""
         try:
-            root = ET.fromstring(content)
-            ns = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-            
-            sitemaps = root.findall('.//ns:loc', ns)
-            if not sitemaps:
-                sitemaps = root.findall('.//loc')
-                
-            for loc in sitemaps:
-                if loc.text:
-                    sub_sitemap_url = loc.text.strip()
-                    # recursively fetch sub sitemaps, but watch the depth
-                    sub_urls = self.fetch_urls(sub_sitemap_url, visited, max_depth - 1)
-                    urls.update(sub_urls)
-                    
-        except ET.ParseError as e:
+            sub_sitemaps = [loc for _, loc in _iter_sitemap([content]) if loc is not None]
+        except expat.ExpatError as e:
             logger.error(f"XML parse error in sitemap index: {e}")
+            return
+        
+        self._fetch_sub_sitemaps(sub_sitemaps, urls, visited, max_depth)
 
+    def _fetch_sub_sitemaps(self, sub_sitemaps: List[str], urls: Set[str], visited: VisitedSet, max_depth: int,
+                            parallel: bool = True) -> bool:
+        """
+        Fetch the sitemaps listed in an index.
+        
+        With parallel set and more than one of them, they are fetched by at
+        most MAX_SITEMAP_WORKERS threads, and everything below them serially
+        in those threads, so a tree never uses more threads (or connections)
+        than the session's pool holds.
+        
+        Returns:
+            True if every sub-sitemap (and everything below it) was read
+        """
+        complete = True
+        if not parallel or len(sub_sitemaps) <= 1:
+            for sub_sitemap_url in sub_sitemaps:
+                sub_urls, sub_complete = self._fetch(sub_sitemap_url, visited, max_depth - 1, parallel)
+                urls.update(sub_urls)
+                complete = complete and sub_complete
+            return complete
+        
+        # each one is a separate download, so fan them out over the session's connections
+        workers = min(MAX_SITEMAP_WORKERS, len(sub_sitemaps))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._fetch, sub_sitemap_url, visited, max_depth - 1, False)
+                       for sub_sitemap_url in sub_sitemaps]
+            for future in as_completed(futures):
+                sub_urls, sub_complete = future.result()
+                urls.update(sub_urls)
+                complete = complete and sub_complete
+        return complete
@@ -1,16 +1,54 @@
-from .base import StorageBackend
-from typing import Optional, Dict, Any, Union, BinaryIO
+from .base import StorageBackend, DEFAULT_MAX_CONCURRENCY
+from typing import Optional, Dict, Any, Union, BinaryIO, Iterable, Tuple
 import logging
+import threading
 
 logger = logging.getLogger('DocuCrawler')
 
+# remote backends already built, keyed by config. they open clients and check
+# the bucket on construction, no need to pay for that twice. local storage is
+# cheap to build and is always built fresh so it re-creates its directory
+_backend_cache: Dict[Tuple, StorageBackend] = {}
+_backend_cache_lock = threading.Lock()
+
+def _config_key(config: dict) -> Optional[Tuple]:
+    """Hashable key for a config, or None if it holds values we can't compare safely."""
+    if not all(isinstance(v, (str, int, float, bool, type(None))) for v in config.values()):
+        return None
+    return tuple(sorted(config.items()))
+
 def get_storage_backend(config: dict) -> StorageBackend:
     """Factory function to get the appropriate storage backend."""
-    storage_type = config.get('storage_type', 'local').lower()
+    key = _config_key(config)
+    if key is None or _storage_type(config) == 'local':
+        return _create_storage_backend(config)
     
+    with _backend_cache_lock:
+        backend = _backend_cache.get(key)
+        # a caller may have closed it, e.g. by using it in a with block
+        if backend is None or backend.closed:
+            backend = _create_storage_backend(config)
+            _backend_cache[key] = backend
+    return backend
+
+def close_storage_backends() -> None:
+    """Close and forget the backends get_storage_backend has built."""
+    with _backend_cache_lock:
+        backends = list(_backend_cache.values())
+        _backend_cache.clear()
+    for backend in backends:
+        backend.close()
+
+def _storage_type(config: dict) -> str:
+    """Get the storage type a config asks for."""
     if config.get('use_gcs'):
-        storage_type = 'gcs'
-        
+        return 'gcs'
+    return config.get('storage_type', 'local').lower()
+
+def _create_storage_backend(config: dict) -> StorageBackend:
+    """Build a new storage backend for config."""
+    storage_type = _storage_type(config)
+    
     if storage_type == 'local':
         from .local import LocalStorageBackend
         return LocalStorageBackend(config.get('output', 'downloaded_docs'))
@@ -90,10 +128,23 @@ class StorageClient:
         """Save a file to the configured storage."""
         self.backend.save_file(file_path, content)
     
+    def save_files(self, items: Iterable[Tuple[str, Union[str, bytes, BinaryIO]]]) -> None:
+        """Save several (file_path, content) pairs to the configured storage."""
+        self.backend.save_files(items)
+    
+    async def save_many_async(self, items: Iterable[Tuple[str, Union[str, bytes, BinaryIO]]],
+                              max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> None:
+        """Save several (file_path, content) pairs concurrently to the configured storage."""
+        await self.backend.save_many_async(items, max_concurrency)
+    
     def exists(self, file_path: str) -> bool:
         """Check if a file exists."""
         return self.backend.exists(file_path)
     
+    def exists_many(self, file_paths: Iterable[str]) -> Dict[str, bool]:
+        """Check which of several files exist."""
+        return self.backend.exists_many(file_paths)
+    
     def get_file(self, file_path: str) -> Optional[bytes]:
         """Retrieve file content."""
         return self.backend.get_file(file_path)
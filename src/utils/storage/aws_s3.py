@@ -1,17 +1,25 @@
 import os
+import gzip
 import logging
-from typing import Optional, Union, BinaryIO
-from .base import StorageBackend
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Union, BinaryIO, Iterable, Tuple
+from .base import StorageBackend, compress_body
 
 logger = logging.getLogger('DocuCrawler')
 
 try:
     import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config
     from botocore.exceptions import ClientError, NoCredentialsError
     S3_AVAILABLE = True
 except ImportError:
     S3_AVAILABLE = False
 
+CONTENT_TYPE = 'text/markdown; charset=utf-8'
+# parallel put_object calls in save_files, each small file is mostly round trip
+MAX_UPLOAD_WORKERS = 32
+
 class S3StorageBackend(StorageBackend):
     """AWS S3 storage backend."""
     
@@ -31,6 +39,8 @@ class S3StorageBackend(StorageBackend):
             secret_access_key: AWS secret access key (optional)
             endpoint_url: Custom S3 endpoint URL (for S3-compatible services)
         """
+        super().__init__()
+        
         if not S3_AVAILABLE:
             raise ImportError(
                 "boto3 is not installed. "
@@ -61,8 +71,16 @@ class S3StorageBackend(StorageBackend):
         if self.region_name:
             client_kwargs['region_name'] = self.region_name
         
+        # streamed uploads of file-like content go multipart above 8 MiB
+        self._transfer_config = TransferConfig(multipart_threshold=8 * 1024 * 1024,
+                                               max_concurrency=16, use_threads=True)
+        
         try:
-            self.s3_client = boto3.client('s3', **client_kwargs)
+            # botocore keeps 10 connections by default, save_files' workers would
+            # keep dropping theirs (and redoing TLS) on a pool that small
+            self.s3_client = boto3.client(
+                's3', config=Config(max_pool_connections=MAX_UPLOAD_WORKERS), **client_kwargs
+            )
             self.s3_resource = boto3.resource('s3', **client_kwargs)
         except NoCredentialsError:
             raise ValueError(
@@ -98,7 +116,9 @@ class S3StorageBackend(StorageBackend):
         
         Args:
             file_path: Path where the file should be saved in the bucket
-            content: Content to write (string, bytes, or file-like object)
+            content: Content to write (string, bytes, or file-like object).
+                     bytes are uploaded as given and file-like objects are
+                     streamed, only strings need an extra encoded copy
         """
         try:
             if isinstance(content, str):
@@ -106,21 +126,52 @@ class S3StorageBackend(StorageBackend):
             elif isinstance(content, bytes):
                 content_bytes = content
             elif hasattr(content, 'read'):
-                content_bytes = content.read()
+                # let the transfer manager stream it (multipart when large)
+                # instead of reading it all into memory first
+                self.s3_client.upload_fileobj(
+                    content, self.bucket_name, file_path,
+                    ExtraArgs={'ContentType': CONTENT_TYPE},
+                    Config=self._transfer_config
+                )
+                self._mark_saved(file_path)
+                logger.debug(f"Saved to S3: s3://{self.bucket_name}/{file_path}")
+                return
             else:
                 raise ValueError(f"Unsupported content type: {type(content)}")
             
+            body, encoding = compress_body(content_bytes)
+            put_kwargs = {'ContentEncoding': encoding} if encoding else {}
+            
             self.s3_client.put_object(
                 Bucket=self.bucket_name,
                 Key=file_path,
-                Body=content_bytes,
-                ContentType='text/markdown; charset=utf-8'
+                Body=body,
+                ContentType=CONTENT_TYPE,
+                **put_kwargs
             )
+            self._mark_saved(file_path)
             logger.debug(f"Saved to S3: s3://{self.bucket_name}/{file_path}")
         except Exception as e:
             logger.error(f"Error saving to S3: {str(e)}")
             raise
     
+    def save_files(self, items: Iterable[Tuple[str, Union[str, bytes, BinaryIO]]]) -> None:
+        """
+        Save several files to S3 concurrently.
+        
+        boto3 clients are thread safe, so the uploads share self.s3_client and
+        their round trips overlap instead of running one after another.
+        
+        Args:
+            items: (file_path, content) pairs
+        """
+        with ThreadPoolExecutor(max_workers=MAX_UPLOAD_WORKERS) as executor:
+            futures = [executor.submit(self.save_file, file_path, content)
+                       for file_path, content in items]
+            # save_file already logged failures, surface the first one
+            for future in futures:
+                future.result()
+    
     def exists(self, file_path: str) -> bool:
         """
         Check if a file exists in S3.
@@ -131,11 +182,16 @@ class S3StorageBackend(StorageBackend):
         Returns:
             True if file exists, False otherwise
         """
+        cached = self._cached_exists(file_path)
+        if cached is not None:
+            return cached
+        
         try:
             self.s3_client.head_object(Bucket=self.bucket_name, Key=file_path)
             return True
         except ClientError as e:
             if e.response['Error']['Code'] == '404':
+                self._mark_missing(file_path)
                 return False
             logger.error(f"Error checking file existence in S3: {str(e)}")
             return False
@@ -150,12 +206,25 @@ class S3StorageBackend(StorageBackend):
         Returns:
             File content as bytes, or None if not found
         """
+        content = self._cached_content(file_path)
+        if content is not None:
+            return content
+        
         try:
             response = self.s3_client.get_object(Bucket=self.bucket_name, Key=file_path)
-            return response['Body'].read()
+            content = response['Body'].read()
+            if response.get('ContentEncoding') == 'gzip':
+                content = gzip.decompress(content)
+            self._remember_content(file_path, content)
+            return content
         except ClientError as e:
             if e.response['Error']['Code'] == 'NoSuchKey':
+                self._mark_missing(file_path)
                 return None
             logger.error(f"Error reading file from S3: {str(e)}")
             return None
+        except Exception as e:
+            # a body that doesn't decode, or a dropped connection mid-read
+            logger.error(f"Error reading file from S3: {str(e)}")
+            return None
 
@@ -1,16 +1,52 @@
 import os
+import gzip
+import functools
+import importlib.util
+import asyncio
 import logging
-from typing import Optional, Union, BinaryIO
-from .base import StorageBackend
+from typing import Optional, Union, BinaryIO, Iterable, Tuple, Dict, Any
+import requests
+from requests.adapters import HTTPAdapter
+from .base import StorageBackend, DEFAULT_MAX_CONCURRENCY, DIGEST_METADATA_KEY, compress_body, content_digest
 
 logger = logging.getLogger('DocuCrawler')
 
 try:
-    from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient
+    from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient, ContentSettings
+    from azure.core.exceptions import ResourceNotFoundError, HttpResponseError
     AZURE_AVAILABLE = True
 except ImportError:
     AZURE_AVAILABLE = False
 
+try:
+    from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+    # the async client additionally needs aiohttp
+    AZURE_AIO_AVAILABLE = importlib.util.find_spec('aiohttp') is not None
+except ImportError:
+    AZURE_AIO_AVAILABLE = False
+
+try:
+    # managed identity / az login / environment credentials for account_name without a key
+    from azure.identity import DefaultAzureCredential
+    AZURE_IDENTITY_AVAILABLE = True
+except ImportError:
+    AZURE_IDENTITY_AVAILABLE = False
+
+CONTENT_TYPE = 'text/markdown; charset=utf-8'
+# blobs up to DEFAULT_MAX_SINGLE_PUT_SIZE go up in one request, larger ones
+# as blocks of DEFAULT_MAX_BLOCK_SIZE uploaded max_concurrency at a time
+DEFAULT_MAX_BLOCK_SIZE = 4 * 1024 * 1024
+DEFAULT_MAX_SINGLE_PUT_SIZE = 8 * 1024 * 1024
+# largest block a single append_block call accepts
+APPEND_BLOCK_SIZE = 4 * 1024 * 1024
+# the SDK's default retry waits 15s and then 45s, which stalls a crawl on one
+# throttled request, retry more often and sooner instead
+RETRY_TOTAL = 5
+RETRY_INITIAL_BACKOFF = 1
+RETRY_INCREMENT_BASE = 2
+# blob clients kept per backend, building one parses the url and clones the pipeline
+BLOB_CLIENT_CACHE_SIZE = 4096
+
 class AzureBlobStorageBackend(StorageBackend):
     """Azure Blob Storage backend."""
     
@@ -18,7 +54,11 @@ class AzureBlobStorageBackend(StorageBackend):
                  container_name: str,
                  connection_string: Optional[str] = None,
                  account_name: Optional[str] = None,
-                 account_key: Optional[str] = None):
+                 account_key: Optional[str] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 max_block_size: int = DEFAULT_MAX_BLOCK_SIZE,
+                 max_single_put_size: int = DEFAULT_MAX_SINGLE_PUT_SIZE,
+                 skip_unchanged: bool = True):
         """
         Initialize Azure Blob Storage backend.
         
@@ -26,8 +66,18 @@ class AzureBlobStorageBackend(StorageBackend):
             container_name: Azure container name
             connection_string: Azure storage connection string (preferred)
             account_name: Azure storage account name (if not using connection string)
-            account_key: Azure storage account key (if not using connection string)
+            account_key: Azure storage account key (if not using connection string),
+                         without it DefaultAzureCredential is used when azure-identity
+                         is installed
+            max_concurrency: Number of connections to keep open to the service, also
+                             the parallel block transfers per upload/download
+            max_block_size: Block size for blobs uploaded in blocks
+            max_single_put_size: Largest blob uploaded in a single request
+            skip_unchanged: Don't upload content the blob already holds, at the
+                            cost of a properties request before each save
         """
+        super().__init__()
+        
         if not AZURE_AVAILABLE:
             raise ImportError(
                 "azure-storage-blob is not installed. "
@@ -38,27 +88,65 @@ class AzureBlobStorageBackend(StorageBackend):
             raise ValueError("Container name is required for Azure storage")
         
         self.container_name = container_name
+        self.max_concurrency = max_concurrency
+        self.skip_unchanged = skip_unchanged
+        self._transfer_args = {'max_block_size': max_block_size,
+                               'max_single_put_size': max_single_put_size,
+                               'retry_total': RETRY_TOTAL,
+                               'initial_backoff': RETRY_INITIAL_BACKOFF,
+                               'increment_base': RETRY_INCREMENT_BASE}
+        # how to build a client, kept so save_many_async can open an async
+        # one on whatever event loop it runs in
+        self._client_args: Dict[str, Any]
+        
+        # one pooled session for every request, the default pool of 10 would
+        # keep dropping connections (and redoing TLS) under concurrent uploads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         
         if connection_string:
-            self.blob_service_client = BlobServiceClient.from_connection_string(connection_string)
+            self._client_args = {'conn_str': connection_string}
+            self.blob_service_client = BlobServiceClient.from_connection_string(
+                connection_string, session=self.session, **self._transfer_args
+            )
         elif account_name and account_key:
             account_url = f"https://{account_name}.blob.core.windows.net"
-            from azure.storage.blob import BlobServiceClient
+            self._client_args = {'account_url': account_url, 'credential': account_key}
             self.blob_service_client = BlobServiceClient(
                 account_url=account_url,
-                credential=account_key
+                credential=account_key,
+                session=self.session,
+                **self._transfer_args
             )
         elif os.environ.get('AZURE_STORAGE_CONNECTION_STRING'):
+            self._client_args = {'conn_str': os.environ.get('AZURE_STORAGE_CONNECTION_STRING')}
             self.blob_service_client = BlobServiceClient.from_connection_string(
-                os.environ.get('AZURE_STORAGE_CONNECTION_STRING')
+                os.environ.get('AZURE_STORAGE_CONNECTION_STRING'), session=self.session,
+                **self._transfer_args
+            )
+        elif account_name and AZURE_IDENTITY_AVAILABLE:
+            account_url = f"https://{account_name}.blob.core.windows.net"
+            # the sync credential can't be handed to the async client
+            self._client_args = {}
+            self.blob_service_client = BlobServiceClient(
+                account_url=account_url,
+                credential=DefaultAzureCredential(),
+                session=self.session,
+                **self._transfer_args
             )
         else:
             raise ValueError(
                 "Azure credentials not found. Provide connection_string or "
-                "(account_name, account_key) or set AZURE_STORAGE_CONNECTION_STRING"
+                "(account_name, account_key) or set AZURE_STORAGE_CONNECTION_STRING, "
+                "or install azure-identity to sign in with account_name only"
             )
         
         self.container_client = self.blob_service_client.get_container_client(container_name)
+        self._blob_client = functools.lru_cache(maxsize=BLOB_CLIENT_CACHE_SIZE)(
+            self.container_client.get_blob_client
+        )
         
         try:
             self.container_client.get_container_properties()
@@ -81,27 +169,205 @@ class AzureBlobStorageBackend(StorageBackend):
             content: Content to write (string, bytes, or file-like object)
         """
         try:
-            blob_client = self.container_client.get_blob_client(file_path)
+            blob_client = self._blob_client(file_path)
+            content_settings = ContentSettings(content_type=CONTENT_TYPE)
             
             if isinstance(content, str):
                 content_bytes = content.encode('utf-8')
             elif isinstance(content, bytes):
                 content_bytes = content
             elif hasattr(content, 'read'):
-                content_bytes = content.read()
+                # hand the stream to the SDK, it uploads it in blocks instead
+                # of us reading the whole thing into memory
+                blob_client.upload_blob(
+                    content,
+                    overwrite=True,
+                    max_concurrency=self.max_concurrency,
+                    content_settings=content_settings
+                )
+                self._mark_saved(file_path)
+                logger.debug(f"Saved to Azure: {self.container_name}/{file_path}")
+                return
             else:
                 raise ValueError(f"Unsupported content type: {type(content)}")
             
+            digest = content_digest(content_bytes)
+            if self.skip_unchanged and self._is_unchanged(blob_client, file_path, content_bytes, digest):
+                self._mark_saved(file_path)
+                logger.debug(f"Unchanged, not uploaded: {self.container_name}/{file_path}")
+                return
+            
+            body, encoding = compress_body(content_bytes)
             blob_client.upload_blob(
-                content_bytes,
+                body,
                 overwrite=True,
-                content_settings={'content_type': 'text/markdown; charset=utf-8'}
+                max_concurrency=self.max_concurrency,
+                content_settings=ContentSettings(content_type=CONTENT_TYPE, content_encoding=encoding),
+                metadata={DIGEST_METADATA_KEY: digest}
             )
+            self._mark_saved(file_path)
             logger.debug(f"Saved to Azure: {self.container_name}/{file_path}")
         except Exception as e:
             logger.error(f"Error saving to Azure: {str(e)}")
             raise
     
+    def _is_unchanged_locally(self, file_path: str, content: bytes) -> Optional[bool]:
+        """
+        Answer whether file_path already holds content from the caches, if possible.
+        
+        Returns:
+            True/False when known, None when the blob properties have to be fetched
+        """
+        cached = self._cached_content(file_path)
+        if cached is not None:
+            return cached == content
+        if self._cached_exists(file_path) is False:
+            return False
+        return None
+    
+    def _is_unchanged(self, blob_client: "BlobClient", file_path: str, content: bytes, digest: str) -> bool:
+        """Check whether the blob at file_path already holds content."""
+        unchanged = self._is_unchanged_locally(file_path, content)
+        if unchanged is not None:
+            return unchanged
+        try:
+            properties = blob_client.get_blob_properties()
+        except ResourceNotFoundError:
+            self._mark_missing(file_path)
+            return False
+        return (properties.metadata or {}).get(DIGEST_METADATA_KEY) == digest
+    
+    async def _is_unchanged_async(self, blob_client, file_path: str, content: bytes, digest: str) -> bool:
+        """_is_unchanged for a blob client of the async SDK."""
+        unchanged = self._is_unchanged_locally(file_path, content)
+        if unchanged is not None:
+            return unchanged
+        try:
+            properties = await blob_client.get_blob_properties()
+        except ResourceNotFoundError:
+            self._mark_missing(file_path)
+            return False
+        return (properties.metadata or {}).get(DIGEST_METADATA_KEY) == digest
+    
+    async def save_many_async(self, items: Iterable[Tuple[str, Union[str, bytes, BinaryIO]]],
+                              max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> None:
+        """
+        Save several files to Azure Blob Storage concurrently.
+        
+        Uses the SDK's async client when aiohttp is installed (and the backend
+        doesn't authenticate through DefaultAzureCredential), otherwise the
+        threaded default.
+        
+        Args:
+            items: (file_path, content) pairs
+            max_concurrency: Maximum number of uploads in flight
+        """
+        if not AZURE_AIO_AVAILABLE or not self._client_args:
+            await super().save_many_async(items, max_concurrency)
+            return
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        if 'conn_str' in self._client_args:
+            service_client = AsyncBlobServiceClient.from_connection_string(
+                self._client_args['conn_str'], **self._transfer_args
+            )
+        else:
+            service_client = AsyncBlobServiceClient(**self._client_args, **self._transfer_args)
+        
+        async with service_client:
+            container_client = service_client.get_container_client(self.container_name)
+            
+            async def upload(file_path, content):
+                if isinstance(content, str):
+                    content = content.encode('utf-8')
+                elif not isinstance(content, bytes):
+                    if not hasattr(content, 'read'):
+                        raise ValueError(f"Unsupported content type: {type(content)}")
+                    content = content.read()
+                digest = content_digest(content)
+                blob_client = container_client.get_blob_client(file_path)
+                async with semaphore:
+                    if self.skip_unchanged and await self._is_unchanged_async(blob_client, file_path, content, digest):
+                        self._mark_saved(file_path)
+                        logger.debug(f"Unchanged, not uploaded: {self.container_name}/{file_path}")
+                        return
+                    body, encoding = compress_body(content)
+                    await blob_client.upload_blob(
+                        body, overwrite=True,
+                        content_settings=ContentSettings(content_type=CONTENT_TYPE, content_encoding=encoding),
+                        metadata={DIGEST_METADATA_KEY: digest}
+                    )
+                self._mark_saved(file_path)
+                logger.debug(f"Saved to Azure: {self.container_name}/{file_path}")
+            
+            results = await asyncio.gather(*(upload(file_path, content) for file_path, content in items),
+                                           return_exceptions=True)
+        
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error(f"Error saving to Azure: {str(result)}")
+                raise result
+    
+    def _download(self, blob_client: "BlobClient") -> bytes:
+        """Download a blob, undoing the gzip content encoding save_file may have applied."""
+        # the SDK would decode the Content-Encoding itself, take the stored
+        # bytes instead so ranged downloads of the gzip body stay consistent
+        downloader = blob_client.download_blob(max_concurrency=self.max_concurrency, decompress=False)
+        content = downloader.readall()
+        if downloader.properties.content_settings.content_encoding == 'gzip':
+            content = gzip.decompress(content)
+        return content
+    
+    def _append_blocks(self, blob_client: "BlobClient", data: bytes) -> None:
+        """Append data to an append blob in blocks the service accepts."""
+        for start in range(0, len(data), APPEND_BLOCK_SIZE):
+            blob_client.append_block(data[start:start + APPEND_BLOCK_SIZE])
+    
+    def append_file(self, file_path: str, content: Union[str, bytes]) -> None:
+        """
+        Append content to a blob using Azure append blobs.
+        
+        Only the new content is sent. A block blob written by save_file is
+        turned into an append blob (one read-modify-write) on its first append.
+        
+        Args:
+            file_path: Path where the file should be appended
+            content: Content to append (string or bytes)
+        """
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        content_settings = ContentSettings(content_type=CONTENT_TYPE)
+        
+        try:
+            blob_client = self._blob_client(file_path)
+            try:
+                if not data and not blob_client.exists():
+                    # an empty append sends no block, so nothing would raise below
+                    raise ResourceNotFoundError('blob not found')
+                self._append_blocks(blob_client, data)
+            except ResourceNotFoundError:
+                blob_client.create_append_blob(content_settings=content_settings)
+                self._append_blocks(blob_client, data)
+            except HttpResponseError as e:
+                if e.error_code != 'InvalidBlobType':
+                    raise
+                # append blobs are kept uncompressed, blocks can't be added to a gzip body
+                existing = self._download(blob_client)
+                blob_client.create_append_blob(content_settings=content_settings)
+                self._append_blocks(blob_client, existing + data)
+            self._mark_saved(file_path)
+            logger.debug(f"Appended to Azure: {self.container_name}/{file_path}")
+        except Exception as e:
+            logger.error(f"Error appending to Azure: {str(e)}")
+            raise
+    
+    def close(self) -> None:
+        """Close the service client and its HTTP session."""
+        self._blob_client.cache_clear()
+        self.blob_service_client.close()
+        self.session.close()
+        super().close()
+    
     def exists(self, file_path: str) -> bool:
         """
         Check if a file exists in Azure Blob Storage.
@@ -112,13 +378,36 @@ class AzureBlobStorageBackend(StorageBackend):
         Returns:
             True if file exists, False otherwise
         """
+        cached = self._cached_exists(file_path)
+        if cached is not None:
+            return cached
+        
         try:
-            blob_client = self.container_client.get_blob_client(file_path)
+            blob_client = self._blob_client(file_path)
             blob_client.get_blob_properties()
             return True
+        except ResourceNotFoundError:
+            self._mark_missing(file_path)
+            return False
         except Exception:
             return False
     
+    def exists_many(self, file_paths: Iterable[str]) -> Dict[str, bool]:
+        """
+        Check several files in Azure Blob Storage, listing each shared prefix once.
+        
+        Args:
+            file_paths: Paths to check
+            
+        Returns:
+            Dict mapping each path to whether it exists
+        """
+        def list_names(prefix):
+            items = self.container_client.walk_blobs(name_starts_with=prefix or None, delimiter='/')
+            return {item.name for item in items}
+        
+        return self._exists_many_by_listing(file_paths, list_names)
+    
     def get_file(self, file_path: str) -> Optional[bytes]:
         """
         Retrieve file content from Azure Blob Storage.
@@ -129,9 +418,18 @@ class AzureBlobStorageBackend(StorageBackend):
         Returns:
             File content as bytes, or None if not found
         """
+        content = self._cached_content(file_path)
+        if content is not None:
+            return content
+        
         try:
-            blob_client = self.container_client.get_blob_client(file_path)
-            return blob_client.download_blob().readall()
+            blob_client = self._blob_client(file_path)
+            content = self._download(blob_client)
+            self._remember_content(file_path, content)
+            return content
+        except ResourceNotFoundError:
+            self._mark_missing(file_path)
+            return None
         except Exception as e:
             logger.error(f"Error reading file from Azure: {str(e)}")
             return None
@@ -1,9 +1,138 @@
+import time
+import gzip
+import hashlib
+import asyncio
+import threading
 from abc import ABC, abstractmethod
-from typing import Optional, List, BinaryIO, Union
+from collections import OrderedDict
+from typing import Optional, List, BinaryIO, Union, Iterable, Tuple, Set, Dict, Callable
+
+# files uploaded at the same time by save_many_async
+DEFAULT_MAX_CONCURRENCY = 16
+
+# remote backends remember a "not found" answer from exists() this long, in seconds
+NEGATIVE_CACHE_TTL = 60.0
+MAX_NEGATIVE_ENTRIES = 4096
+# total size of file contents remote backends keep in memory for get_file
+DEFAULT_READ_CACHE_BYTES = 128 * 1024 * 1024
+# remote bodies from this size on are stored gzip-compressed with the
+# Content-Encoding set, so http clients and get_file see the original bytes
+GZIP_MIN_SIZE = 1024
+# object metadata field remote backends store content_digest under, so a
+# save of unchanged content can be skipped
+DIGEST_METADATA_KEY = 'content_digest'
+
+def compress_body(content: bytes) -> Tuple[bytes, Optional[str]]:
+    """
+    Compress an upload body if it is worth it.
+    
+    Args:
+        content: Bytes to upload
+        
+    Returns:
+        (body to send, Content-Encoding to store or None)
+    """
+    if len(content) >= GZIP_MIN_SIZE:
+        return gzip.compress(content), 'gzip'
+    return content, None
+
+def content_digest(content: bytes) -> str:
+    """Digest identifying content, stored with uploads to detect unchanged saves."""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
 
 class StorageBackend(ABC):
     """Abstract base class for storage backends."""
     
+    def __init__(self, read_cache_bytes: int = DEFAULT_READ_CACHE_BYTES):
+        """
+        Initialize the lookup caches shared by the backends.
+        
+        Args:
+            read_cache_bytes: Total size of file contents to keep for get_file
+                              (0 disables the content cache)
+        """
+        # paths written through this backend, which exist without asking
+        self._saved: Set[str] = set()
+        # path -> monotonic time exists() last found it missing, oldest first
+        self._missing: "OrderedDict[str, float]" = OrderedDict()
+        # path -> content, least recently used first, at most read_cache_bytes in total
+        self._contents: "OrderedDict[str, bytes]" = OrderedDict()
+        self._contents_size = 0
+        self.read_cache_bytes = read_cache_bytes
+        self._exists_lock = threading.Lock()
+        # set by close(), the factory builds a new backend instead of handing this one out
+        self.closed = False
+    
+    def _cached_exists(self, file_path: str) -> Optional[bool]:
+        """
+        Answer exists() from what this backend has already seen, if possible.
+        
+        Returns:
+            True/False when known, None when the remote has to be asked
+        """
+        with self._exists_lock:
+            if file_path in self._saved or file_path in self._contents:
+                return True
+            missing_since = self._missing.get(file_path)
+            if missing_since is not None:
+                if time.monotonic() - missing_since < NEGATIVE_CACHE_TTL:
+                    return False
+                del self._missing[file_path]
+        return None
+    
+    def _mark_saved(self, file_path: str) -> None:
+        """
+        Record that file_path was written.
+        
+        The content cache is read-through only, a write just drops the stale
+        entry. The crawler rarely reads back what it saved, keeping every
+        upload would only pin memory.
+        
+        Args:
+            file_path: Path that was written
+        """
+        with self._exists_lock:
+            self._saved.add(file_path)
+            self._missing.pop(file_path, None)
+        self._forget_content(file_path)
+    
+    def _cached_content(self, file_path: str) -> Optional[bytes]:
+        """Get cached content for file_path, or None if it isn't cached."""
+        with self._exists_lock:
+            content = self._contents.get(file_path)
+            if content is not None:
+                self._contents.move_to_end(file_path)
+            return content
+    
+    def _remember_content(self, file_path: str, content: bytes) -> None:
+        """Cache content read from file_path, evicting the least recently used."""
+        with self._exists_lock:
+            old = self._contents.pop(file_path, None)
+            if old is not None:
+                self._contents_size -= len(old)
+            if len(content) > self.read_cache_bytes:
+                return
+            self._contents[file_path] = content
+            self._contents_size += len(content)
+            while self._contents_size > self.read_cache_bytes:
+                _, evicted = self._contents.popitem(last=False)
+                self._contents_size -= len(evicted)
+    
+    def _forget_content(self, file_path: str) -> None:
+        """Drop cached content for file_path."""
+        with self._exists_lock:
+            old = self._contents.pop(file_path, None)
+            if old is not None:
+                self._contents_size -= len(old)
+    
+    def _mark_missing(self, file_path: str) -> None:
+        """Record that the remote reported file_path as missing."""
+        with self._exists_lock:
+            self._missing[file_path] = time.monotonic()
+            self._missing.move_to_end(file_path)
+            if len(self._missing) > MAX_NEGATIVE_ENTRIES:
+                self._missing.popitem(last=False)
+    
     @abstractmethod
     def save_file(self, file_path: str, content: Union[str, bytes, BinaryIO]) -> None:
         """
@@ -41,6 +170,112 @@ class StorageBackend(ABC):
         """
         pass
 
+    def exists_many(self, file_paths: Iterable[str]) -> Dict[str, bool]:
+        """
+        Check several files at once.
+        
+        Default implementation calls exists for each path.
+        
+        Args:
+            file_paths: Paths to check
+            
+        Returns:
+            Dict mapping each path to whether it exists
+        """
+        return {file_path: self.exists(file_path) for file_path in file_paths}
+    
+    def _exists_many_by_listing(self, file_paths: Iterable[str],
+                                list_names: Callable[[str], Set[str]]) -> Dict[str, bool]:
+        """
+        exists_many for object stores that can list a "directory" in one call.
+        
+        Paths the caches can't answer are grouped by parent prefix. A prefix
+        with several of them is listed once, a lone path gets a plain exists.
+        
+        Args:
+            file_paths: Paths to check
+            list_names: Returns the object names directly under a prefix
+                        ('' or ending in '/')
+        """
+        results: Dict[str, bool] = {}
+        by_prefix: Dict[str, List[str]] = {}
+        for file_path in file_paths:
+            cached = self._cached_exists(file_path)
+            if cached is not None:
+                results[file_path] = cached
+            else:
+                prefix = file_path.rpartition('/')[0]
+                by_prefix.setdefault(f"{prefix}/" if prefix else '', []).append(file_path)
+        
+        for prefix, paths in by_prefix.items():
+            if len(paths) == 1:
+                results[paths[0]] = self.exists(paths[0])
+                continue
+            names = list_names(prefix)
+            for file_path in paths:
+                found = file_path in names
+                if not found:
+                    self._mark_missing(file_path)
+                results[file_path] = found
+        return results
+    
+    def save_files(self, items: Iterable[Tuple[str, Union[str, bytes, BinaryIO]]]) -> None:
+        """
+        Save several files.
+        
+        Default implementation just calls save_file for each item.
+        Remote backends can override it to overlap the uploads.
+        
+        Args:
+            items: (file_path, content) pairs
+        """
+        for file_path, content in items:
+            self.save_file(file_path, content)
+
+    async def save_many_async(self, items: Iterable[Tuple[str, Union[str, bytes, BinaryIO]]],
+                              max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> None:
+        """
+        Save several files with up to max_concurrency uploads in flight.
+        
+        Default implementation runs save_file in worker threads, which is
+        enough to overlap network round trips for remote backends. Backends
+        with an async client can override it.
+        
+        Args:
+            items: (file_path, content) pairs
+            max_concurrency: Maximum number of files saved at the same time
+            
+        Raises:
+            The first error any of the saves raised, once all have finished
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def save(file_path, content):
+            async with semaphore:
+                await asyncio.to_thread(self.save_file, file_path, content)
+        
+        results = await asyncio.gather(*(save(file_path, content) for file_path, content in items),
+                                       return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    def close(self) -> None:
+        """
+        Release connections held by the backend.
+        
+        Default implementation only marks the backend closed. Backends holding
+        connections that should not wait for garbage collection override it
+        and call it too.
+        """
+        self.closed = True
+    
+    def __enter__(self) -> "StorageBackend":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def append_file(self, file_path: str, content: Union[str, bytes]) -> None:
         """
         Append content to a file. 
@@ -59,14 +294,9 @@ class StorageBackend(ABC):
             self.save_file(file_path, content)
             return
 
+        # files are stored as utf-8, so appending the encoded string gives the
+        # same bytes as decoding, concatenating and encoding everything again
         if isinstance(content, str):
-            # decode existing content so we can append strings
-            try:
-                new_content = existing.decode('utf-8') + content
-                self.save_file(file_path, new_content)
-            except UnicodeDecodeError:
-                # not utf-8, just append as bytes
-                self.save_file(file_path, existing + content.encode('utf-8'))
-        else:
-            self.save_file(file_path, existing + content)
+            content = content.encode('utf-8')
+        self.save_file(file_path, existing + content)
 
@@ -1,12 +1,15 @@
 import os
+import uuid
 import logging
-from typing import Optional, Union, BinaryIO
-from .base import StorageBackend
+from typing import Optional, Union, BinaryIO, Iterable, Dict
+from requests.adapters import HTTPAdapter
+from .base import StorageBackend, DEFAULT_MAX_CONCURRENCY, DIGEST_METADATA_KEY, compress_body, content_digest
 
 logger = logging.getLogger('DocuCrawler')
 
 try:
     from google.cloud import storage
+    from google.api_core.exceptions import NotFound
     from google.oauth2 import service_account
     GCS_AVAILABLE = True
 except ImportError:
@@ -18,7 +21,9 @@ class GCSStorageBackend(StorageBackend):
     def __init__(self, 
                  bucket_name: str,
                  project_id: Optional[str] = None,
-                 credentials_path: Optional[str] = None):
+                 credentials_path: Optional[str] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 skip_unchanged: bool = True):
         """
         Initialize GCS storage backend.
         
@@ -26,7 +31,12 @@ class GCSStorageBackend(StorageBackend):
             bucket_name: GCS bucket name
             project_id: Google Cloud project ID (optional)
             credentials_path: Path to GCS credentials JSON file
+            max_concurrency: Number of connections to keep open to the service
+            skip_unchanged: Don't upload content the object already holds, at the
+                            cost of a metadata request before each save
         """
+        super().__init__()
+        
         if not GCS_AVAILABLE:
             raise ImportError(
                 "google-cloud-storage is not installed. "
@@ -37,6 +47,7 @@ class GCSStorageBackend(StorageBackend):
             raise ValueError("Bucket name is required for GCS storage")
         
         self.bucket_name = bucket_name
+        self.skip_unchanged = skip_unchanged
         self.project_id = project_id
         
         client_kwargs = {}
@@ -59,6 +70,11 @@ class GCSStorageBackend(StorageBackend):
         else:
             self.client = storage.Client(**client_kwargs)
         
+        # the client's authorized session is a requests.Session, give it a pool
+        # large enough that concurrent uploads reuse their TLS connections
+        adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency)
+        self.client._http.mount('https://', adapter)
+        
         self.bucket = self.client.bucket(bucket_name)
         
         if not self.bucket.exists():
@@ -94,13 +110,88 @@ class GCSStorageBackend(StorageBackend):
             else:
                 raise ValueError(f"Unsupported content type: {type(content)}")
             
+            digest = content_digest(content_bytes)
+            if self.skip_unchanged and self._is_unchanged(file_path, content_bytes, digest):
+                self._mark_saved(file_path)
+                logger.debug(f"Unchanged, not uploaded: gs://{self.bucket_name}/{file_path}")
+                return
+            
+            body, encoding = compress_body(content_bytes)
             blob = self.bucket.blob(file_path)
-            blob.upload_from_string(content_bytes, content_type='text/markdown; charset=utf-8')
+            # GCS serves (and the client downloads) gzip encoded objects decompressed
+            blob.content_encoding = encoding
+            blob.metadata = {DIGEST_METADATA_KEY: digest}
+            blob.upload_from_string(body, content_type='text/markdown; charset=utf-8')
+            self._mark_saved(file_path)
             logger.debug(f"Saved to GCS: gs://{self.bucket_name}/{file_path}")
         except Exception as e:
             logger.error(f"Error saving to GCS: {str(e)}")
             raise
     
+    def _is_unchanged(self, file_path: str, content: bytes, digest: str) -> bool:
+        """Check whether the object at file_path already holds content."""
+        cached = self._cached_content(file_path)
+        if cached is not None:
+            return cached == content
+        if self._cached_exists(file_path) is False:
+            return False
+        blob = self.bucket.get_blob(file_path)
+        if blob is None:
+            self._mark_missing(file_path)
+            return False
+        return (blob.metadata or {}).get(DIGEST_METADATA_KEY) == digest
+    
+    def append_file(self, file_path: str, content: Union[str, bytes]) -> None:
+        """
+        Append content to a GCS object by composing it server side.
+        
+        The new content is uploaded as a temporary object and composed onto
+        the end of the existing one, so only the appended bytes are sent.
+        
+        Args:
+            file_path: Path where the file should be appended
+            content: Content to append (string or bytes)
+        """
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        
+        try:
+            existing = self.bucket.get_blob(file_path)
+            if existing is None or existing.content_encoding == 'gzip':
+                # composing plain bytes onto a gzip body would corrupt it, so a
+                # compressed object is rewritten uncompressed once and appended
+                # to natively from then on
+                if existing is not None:
+                    data = existing.download_as_bytes() + data
+                self.bucket.blob(file_path).upload_from_string(data, content_type='text/markdown; charset=utf-8')
+                self._mark_saved(file_path)
+                return
+        except Exception as e:
+            logger.error(f"Error appending to GCS: {str(e)}")
+            raise
+        
+        temp_blob = self.bucket.blob(f"{file_path}.append-{uuid.uuid4().hex}")
+        try:
+            temp_blob.upload_from_string(data, content_type='text/markdown; charset=utf-8')
+            target = self.bucket.blob(file_path)
+            target.content_type = 'text/markdown; charset=utf-8'
+            try:
+                target.compose([self.bucket.blob(file_path), temp_blob])
+            except NotFound:
+                # deleted since we looked it up
+                self.bucket.blob(file_path).upload_from_string(data, content_type='text/markdown; charset=utf-8')
+                self._mark_saved(file_path)
+                return
+            self._mark_saved(file_path)
+            logger.debug(f"Appended to GCS: gs://{self.bucket_name}/{file_path}")
+        except Exception as e:
+            logger.error(f"Error appending to GCS: {str(e)}")
+            raise
+        finally:
+            try:
+                temp_blob.delete()
+            except Exception:
+                pass
+    
     def exists(self, file_path: str) -> bool:
         """
         Check if a file exists in GCS.
@@ -111,13 +202,36 @@ class GCSStorageBackend(StorageBackend):
         Returns:
             True if file exists, False otherwise
         """
+        cached = self._cached_exists(file_path)
+        if cached is not None:
+            return cached
+        
         try:
             blob = self.bucket.blob(file_path)
-            return blob.exists()
+            if blob.exists():
+                return True
+            self._mark_missing(file_path)
+            return False
         except Exception as e:
             logger.error(f"Error checking file existence in GCS: {str(e)}")
             return False
     
+    def exists_many(self, file_paths: Iterable[str]) -> Dict[str, bool]:
+        """
+        Check several files in GCS, listing each shared prefix once.
+        
+        Args:
+            file_paths: Paths to check
+            
+        Returns:
+            Dict mapping each path to whether it exists
+        """
+        def list_names(prefix):
+            blobs = self.client.list_blobs(self.bucket, prefix=prefix, delimiter='/')
+            return {blob.name for blob in blobs}
+        
+        return self._exists_many_by_listing(file_paths, list_names)
+    
     def get_file(self, file_path: str) -> Optional[bytes]:
         """
         Retrieve file content from GCS.
@@ -128,11 +242,18 @@ class GCSStorageBackend(StorageBackend):
         Returns:
             File content as bytes, or None if not found
         """
+        content = self._cached_content(file_path)
+        if content is not None:
+            return content
+        
         try:
-            blob = self.bucket.blob(file_path)
-            if not blob.exists():
-                return None
-            return blob.download_as_bytes()
+            # just try the download, checking exists() first costs a round trip
+            content = self.bucket.blob(file_path).download_as_bytes()
+            self._remember_content(file_path, content)
+            return content
+        except NotFound:
+            self._mark_missing(file_path)
+            return None
         except Exception as e:
             logger.error(f"Error reading file from GCS: {str(e)}")
             return None
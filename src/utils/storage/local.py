@@ -1,11 +1,73 @@
+import io
 import os
+import re
+import shutil
 import logging
+import functools
+import posixpath
 from pathlib import Path
-from typing import Optional, Union, BinaryIO
+from typing import Optional, Union, BinaryIO, Iterable, Dict, List, Set, Tuple
 from .base import StorageBackend
 
 logger = logging.getLogger('DocuCrawler')
 
+# windows special characters that break things
+_UNSAFE_CHARS = str.maketrans('', '', '<>:"|?*')
+# '..' components normpath leaves at the front, they would climb out of output_dir
+_LEADING_PARENT_RE = re.compile(r'^(?:\.\.(?:/|$))+')
+
+@functools.lru_cache(maxsize=65536)
+def _sanitize_path(file_path: str) -> Path:
+    """Sanitized relative Path for file_path, cached since it only depends on the string."""
+    # strip the special characters first so they can't hide a '..' from normpath
+    path = file_path.translate(_UNSAFE_CHARS).replace('\\', '/').lstrip('/')
+    if path:
+        # block directory traversal attempts
+        path = _LEADING_PARENT_RE.sub('', posixpath.normpath(path))
+    return Path(path) if path and path != '.' else Path('index.md')
+
+# output paths LocalStorageBackend remembers per instance
+FULL_PATH_CACHE_SIZE = 65536
+
+# bytes handed to the kernel per copy_file_range call
+COPY_CHUNK_SIZE = 1024 * 1024
+
+def _copy_stream(source: BinaryIO, destination: BinaryIO) -> None:
+    """
+    Copy the rest of source into destination.
+    
+    Real files are copied inside the kernel with copy_file_range where the
+    platform has it, anything else goes through shutil.copyfileobj.
+    """
+    if hasattr(os, 'copy_file_range'):
+        try:
+            src_fd = source.fileno()
+            offset = source.tell()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            src_fd = None
+        
+        if src_fd is not None:
+            destination.flush()
+            dst_fd = destination.fileno()
+            start = offset
+            try:
+                while True:
+                    copied = os.copy_file_range(src_fd, dst_fd, COPY_CHUNK_SIZE, offset)
+                    if not copied:
+                        break
+                    offset += copied
+            except OSError:
+                # e.g. not supported between these filesystems, carry on in python
+                if offset == start:
+                    source.seek(offset)
+                    shutil.copyfileobj(source, destination)
+                    return
+                raise
+            source.seek(offset)
+            return
+    
+    shutil.copyfileobj(source, destination)
+
 class LocalStorageBackend(StorageBackend):
     """Local filesystem storage backend."""
     
@@ -16,8 +78,14 @@ class LocalStorageBackend(StorageBackend):
         Args:
             output_dir: Directory where files will be saved
         """
+        super().__init__()
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # directories made (or found) by this backend, no need to mkdir them again
+        self._known_dirs: Set[Path] = {self.output_dir}
+        # file_path -> output_dir / sanitized path, the same path is usually
+        # saved, checked and appended to several times
+        self._full_path = functools.lru_cache(maxsize=FULL_PATH_CACHE_SIZE)(self._resolve)
         logger.info(f"Initialized local storage at: {self.output_dir.absolute()}")
     
     def save_file(self, file_path: str, content: Union[str, bytes, BinaryIO]) -> None:
@@ -28,16 +96,16 @@ class LocalStorageBackend(StorageBackend):
             file_path: Relative path where the file should be saved
             content: Content to write (string, bytes, or file-like object)
         """
-        safe_path = self._sanitize_path(file_path)
-        full_path = self.output_dir / safe_path
-        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path = self._full_path(file_path)
+        self._ensure_parent(full_path)
         
         if isinstance(content, str):
             full_path.write_text(content, encoding='utf-8')
         elif isinstance(content, bytes):
             full_path.write_bytes(content)
         elif hasattr(content, 'read'):
-            full_path.write_bytes(content.read())
+            with open(full_path, 'wb') as f:
+                _copy_stream(content, f)
         else:
             raise ValueError(f"Unsupported content type: {type(content)}")
         
@@ -53,10 +121,35 @@ class LocalStorageBackend(StorageBackend):
         Returns:
             True if file exists, False otherwise
         """
-        safe_path = self._sanitize_path(file_path)
-        full_path = self.output_dir / safe_path
+        full_path = self._full_path(file_path)
         return full_path.exists()
     
+    def exists_many(self, file_paths: Iterable[str]) -> Dict[str, bool]:
+        """
+        Check several local files, reading each directory once.
+        
+        Args:
+            file_paths: Relative paths to check
+            
+        Returns:
+            Dict mapping each path to whether it exists
+        """
+        by_parent: Dict[Path, List[Tuple[str, str]]] = {}
+        for file_path in file_paths:
+            full_path = self._full_path(file_path)
+            by_parent.setdefault(full_path.parent, []).append((file_path, full_path.name))
+        
+        results: Dict[str, bool] = {}
+        for parent, entries in by_parent.items():
+            try:
+                with os.scandir(parent) as it:
+                    names: Set[str] = {entry.name for entry in it}
+            except (FileNotFoundError, NotADirectoryError):
+                names = set()
+            for file_path, name in entries:
+                results[file_path] = name in names
+        return results
+    
     def get_file(self, file_path: str) -> Optional[bytes]:
         """
         Retrieve file content from local storage.
@@ -67,14 +160,13 @@ class LocalStorageBackend(StorageBackend):
         Returns:
             File content as bytes, or None if not found
         """
-        safe_path = self._sanitize_path(file_path)
-        full_path = self.output_dir / safe_path
-        
-        if not full_path.exists():
-            return None
+        full_path = self._full_path(file_path)
         
+        # open straight away instead of stat-ing first, a missing file is the exception
         try:
             return full_path.read_bytes()
+        except FileNotFoundError:
+            return None
         except Exception as e:
             logger.error(f"Error reading file {file_path}: {str(e)}")
             return None
@@ -87,9 +179,8 @@ class LocalStorageBackend(StorageBackend):
             file_path: Relative path where the file should be appended
             content: Content to append (string or bytes)
         """
-        safe_path = self._sanitize_path(file_path)
-        full_path = self.output_dir / safe_path
-        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path = self._full_path(file_path)
+        self._ensure_parent(full_path)
         
         mode = 'a' if isinstance(content, str) else 'ab'
         encoding = 'utf-8' if isinstance(content, str) else None
@@ -99,6 +190,17 @@ class LocalStorageBackend(StorageBackend):
             
         logger.debug(f"Appended to local file: {full_path}")
     
+    def _resolve(self, file_path: str) -> Path:
+        """Get the full output path for file_path."""
+        return self.output_dir / self._sanitize_path(file_path)
+    
+    def _ensure_parent(self, full_path: Path) -> None:
+        """Create the directory full_path goes into unless it is known to exist."""
+        parent = full_path.parent
+        if parent not in self._known_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(parent)
+    
     def _sanitize_path(self, file_path: str) -> Path:
         """
         Sanitize file path to prevent directory traversal attacks.
@@ -109,20 +211,4 @@ class LocalStorageBackend(StorageBackend):
         Returns:
             Sanitized Path object
         """
-        path = file_path.lstrip('/').lstrip('\\')
-        path = path.replace('\\', '/')
-        
-        parts = []
-        for part in path.split('/'):
-            if part == '..':
-                # block directory traversal attempts
-                if parts:
-                    parts.pop()
-            elif part and part != '.':
-                # remove Windows special characters that break things
-                part = part.translate(str.maketrans('', '', '<>:"|?*'))
-                if part:
-                    parts.append(part)
-        
-        return Path(*parts) if parts else Path('index.md')
-
+        return _sanitize_path(file_path)
@@ -1,8 +1,16 @@
 import os
+import shlex
+import shutil
+import asyncio
 import logging
+import posixpath
+import weakref
+import tempfile
+import subprocess
 from pathlib import Path
-from typing import Optional, Union, BinaryIO
-from .base import StorageBackend
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Union, BinaryIO, Iterable, Tuple, Set, List
+from .base import StorageBackend, DEFAULT_MAX_CONCURRENCY
 
 logger = logging.getLogger('DocuCrawler')
 
@@ -13,6 +21,34 @@ try:
 except ImportError:
     SFTP_AVAILABLE = False
 
+# sftp channels save_many_async opens on the one ssh connection, servers
+# usually cap sessions per connection (OpenSSH at 10 by default)
+MAX_SFTP_CHANNELS = 4
+# batches at least this big go over one rsync run instead of file by file
+RSYNC_MIN_FILES = 32
+# seconds between keepalive packets, so NAT and firewalls don't drop the
+# connection while a long crawl is busy elsewhere
+KEEPALIVE_INTERVAL = 30
+# where the system ssh (used by rsync) looks up host keys, paramiko's
+# AutoAddPolicy doesn't write to them
+KNOWN_HOSTS_FILES = ('~/.ssh/known_hosts', '/etc/ssh/ssh_known_hosts')
+
+def _close_clients(*clients) -> None:
+    """Close SFTP/SSH clients, ignoring errors from connections already gone."""
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
+
+def _stop_ssh_master(ssh: List[str], destination: str, control_dir: str) -> None:
+    """Stop the ssh connection rsync left running in control_dir and remove the directory."""
+    try:
+        subprocess.run(ssh + ['-O', 'exit', destination], capture_output=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        pass
+    shutil.rmtree(control_dir, ignore_errors=True)
+
 class SFTPStorageBackend(StorageBackend):
     """SFTP storage backend."""
     
@@ -34,6 +70,8 @@ class SFTPStorageBackend(StorageBackend):
             key_filename: Path to SSH private key file (optional)
             remote_path: Base remote path where files will be stored
         """
+        super().__init__()
+        
         if not SFTP_AVAILABLE:
             raise ImportError(
                 "paramiko is not installed. "
@@ -49,6 +87,10 @@ class SFTPStorageBackend(StorageBackend):
         self.port = port
         self.key_filename = key_filename or os.environ.get('SFTP_KEY_FILE')
         self.remote_path = remote_path.rstrip('/')
+        # remote directories known to exist
+        self._known_dirs: Set[str] = set()
+        # rsync command for batch uploads, decided on first use (False: not usable)
+        self._rsync: Optional[Union[List[str], bool]] = None
         
         self.ssh_client = SSHClient()
         self.ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
@@ -62,30 +104,78 @@ class SFTPStorageBackend(StorageBackend):
                 key_filename=self.key_filename,
                 timeout=30
             )
+            self.ssh_client.get_transport().set_keepalive(KEEPALIVE_INTERVAL)
             self.sftp_client = self.ssh_client.open_sftp()
+            # closes the connection when the backend is collected, unless close() did already
+            self._finalizer = weakref.finalize(self, _close_clients, self.sftp_client, self.ssh_client)
             logger.info(f"Successfully connected to SFTP server: {hostname}:{port}")
             
             if self.remote_path:
                 self._ensure_remote_directory(self.remote_path)
         except Exception as e:
             logger.error(f"Failed to connect to SFTP server: {str(e)}")
+            self.ssh_client.close()
             raise
     
     def _ensure_remote_directory(self, remote_dir: str) -> None:
         """Ensure remote directory exists, creating it if necessary."""
+        # every stat/mkdir is a round trip, directories seen once are known to stay
+        if remote_dir in self._known_dirs:
+            return
+        
         try:
             self.sftp_client.stat(remote_dir)
         except IOError:
             parts = remote_dir.strip('/').split('/')
-            current_path = ''
+            current_path = '/' if remote_dir.startswith('/') else ''
             for part in parts:
                 if part:
-                    current_path = f"{current_path}/{part}" if current_path else part
+                    current_path = f"{current_path.rstrip('/')}/{part}" if current_path else part
+                    if current_path in self._known_dirs:
+                        continue
                     try:
                         self.sftp_client.stat(current_path)
                     except IOError:
                         self.sftp_client.mkdir(current_path)
                         logger.debug(f"Created remote directory: {current_path}")
+                    self._known_dirs.add(current_path)
+        self._known_dirs.add(remote_dir)
+    
+    def _full_remote_path(self, file_path: str) -> str:
+        """Get the remote path for a file path relative to remote_path."""
+        return f"{self.remote_path}/{file_path}" if self.remote_path else file_path
+    
+    def _ensure_parent_directory(self, full_remote_path: str) -> None:
+        """Ensure the directory a remote file goes into exists."""
+        remote_dir = full_remote_path.rpartition('/')[0]
+        if remote_dir:
+            self._ensure_remote_directory(remote_dir)
+    
+    def _write(self, sftp_client: "SFTPClient", file_path: str, content: Union[str, bytes, BinaryIO]) -> None:
+        """Write content to file_path over sftp_client, the parent directory must exist."""
+        full_remote_path = self._full_remote_path(file_path)
+        
+        if isinstance(content, str):
+            content_bytes = content.encode('utf-8')
+        elif isinstance(content, bytes):
+            content_bytes = content
+        elif hasattr(content, 'read'):
+            # copy the stream over in chunks instead of reading it into memory,
+            # and skip putfo's confirming stat round trip
+            sftp_client.putfo(content, full_remote_path, confirm=False)
+            self._mark_saved(file_path)
+            logger.debug(f"Saved via SFTP: {full_remote_path}")
+            return
+        else:
+            raise ValueError(f"Unsupported content type: {type(content)}")
+        
+        with sftp_client.open(full_remote_path, 'wb') as remote_file:
+            # keep sending write requests without waiting for each reply
+            remote_file.set_pipelined(True)
+            remote_file.write(content_bytes)
+        self._mark_saved(file_path)
+        
+        logger.debug(f"Saved via SFTP: {full_remote_path}")
     
     def save_file(self, file_path: str, content: Union[str, bytes, BinaryIO]) -> None:
         """
@@ -96,33 +186,178 @@ class SFTPStorageBackend(StorageBackend):
             content: Content to write (string, bytes, or file-like object)
         """
         try:
-            if self.remote_path:
-                full_remote_path = f"{self.remote_path}/{file_path}"
-            else:
-                full_remote_path = file_path
-            
-            path_parts = full_remote_path.split('/')
-            if len(path_parts) > 1:
-                remote_dir = '/'.join(path_parts[:-1])
-                if remote_dir:
-                    self._ensure_remote_directory(remote_dir)
-            
-            if isinstance(content, str):
-                content_bytes = content.encode('utf-8')
-            elif isinstance(content, bytes):
-                content_bytes = content
-            elif hasattr(content, 'read'):
-                content_bytes = content.read()
-            else:
-                raise ValueError(f"Unsupported content type: {type(content)}")
-            
-            with self.sftp_client.open(full_remote_path, 'wb') as remote_file:
-                remote_file.write(content_bytes)
+            self._ensure_parent_directory(self._full_remote_path(file_path))
+            self._write(self.sftp_client, file_path, content)
+        except Exception as e:
+            logger.error(f"Error saving via SFTP: {str(e)}")
+            raise
+    
+    def _host_in_known_hosts(self) -> bool:
+        """Check whether the system ssh would accept the server's host key without asking."""
+        host = self.hostname if self.port == 22 else f"[{self.hostname}]:{self.port}"
+        for path in KNOWN_HOSTS_FILES:
+            try:
+                if paramiko.HostKeys(os.path.expanduser(path)).lookup(host) is not None:
+                    return True
+            except (IOError, paramiko.SSHException):
+                continue
+        return False
+    
+    def _rsync_command(self) -> Optional[List[str]]:
+        """Get the rsync command for a batch upload, or None if rsync can't be used."""
+        if self._rsync is None:
+            self._rsync = self._build_rsync_command() or False
+        return self._rsync or None
+    
+    def _build_rsync_command(self) -> Optional[List[str]]:
+        """
+        Build the rsync command for batch uploads, or None if rsync can't be used.
+        
+        rsync runs the system ssh, which can't be given a password or accept
+        an unknown host key, so it is only used for key (or agent)
+        authentication against a host already in known_hosts.
+        """
+        if self.password or not shutil.which('rsync') or not shutil.which('ssh'):
+            return None
+        if not self._host_in_known_hosts():
+            logger.info(f"{self.hostname} is not in known_hosts, batches are uploaded over SFTP instead of rsync")
+            return None
+        
+        # a private directory for the connection sharing socket, /tmp is world writable
+        control_dir = tempfile.mkdtemp(prefix='docu-crawler-ssh-')
+        ssh = ['ssh', '-p', str(self.port), '-o', 'BatchMode=yes',
+               # later batches reuse the connection of the first
+               '-o', 'ControlMaster=auto', '-o', 'ControlPersist=60s',
+               '-o', f'ControlPath={control_dir}/%C']
+        if self.key_filename:
+            ssh += ['-i', self.key_filename]
+        login = f"{self.username}@{self.hostname}"
+        self._rsync_finalizer = weakref.finalize(self, _stop_ssh_master, ssh, login, control_dir)
+        destination = f"{login}:{self.remote_path + '/' if self.remote_path else ''}"
+        # --files-from reads the paths from stdin and creates their directories
+        return ['rsync', '-az', '--whole-file', '--files-from=-', '--from0',
+                '-e', shlex.join(ssh), '.', destination]
+    
+    def save_files(self, items: Iterable[Tuple[str, Union[str, bytes, BinaryIO]]]) -> None:
+        """
+        Save several files via SFTP.
+        
+        Large batches are staged in a local temporary directory and pushed in
+        a single rsync over SSH run, instead of an open/write/close (and
+        stat/mkdir) round trip per file. Falls back to saving file by file
+        when rsync isn't available, a password is used, or rsync fails.
+        
+        Args:
+            items: (file_path, content) pairs
+        """
+        items = list(items)
+        command = self._rsync_command() if len(items) >= RSYNC_MIN_FILES else None
+        if command is None or any(posixpath.isabs(file_path) or posixpath.normpath(file_path).startswith('..')
+                                  for file_path, _ in items):
+            super().save_files(items)
+            return
+        
+        with tempfile.TemporaryDirectory(prefix='docu-crawler-') as staging_dir:
+            staged: List[str] = []
+            for file_path, content in items:
+                local_path = os.path.join(staging_dir, file_path)
+                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                with open(local_path, 'wb') as f:
+                    if isinstance(content, str):
+                        content = content.encode('utf-8')
+                    if isinstance(content, bytes):
+                        f.write(content)
+                    elif hasattr(content, 'read'):
+                        shutil.copyfileobj(content, f)
+                    else:
+                        raise ValueError(f"Unsupported content type: {type(content)}")
+                staged.append(file_path)
             
-            logger.debug(f"Saved via SFTP: {full_remote_path}")
+            try:
+                subprocess.run(command, cwd=staging_dir, check=True, capture_output=True,
+                               input=b'\0'.join(path.encode('utf-8') for path in staged))
+            except (OSError, subprocess.CalledProcessError) as e:
+                stderr = getattr(e, 'stderr', None) or b''
+                # don't retry (and warn) on every batch
+                self._rsync = False
+                logger.warning(f"rsync upload failed, uploading over SFTP from now on: "
+                               f"{stderr.decode('utf-8', 'replace').strip() or e}")
+                for file_path in staged:
+                    with open(os.path.join(staging_dir, file_path), 'rb') as f:
+                        self.save_file(file_path, f)
+                return
+        
+        for file_path in staged:
+            self._mark_saved(file_path)
+        logger.debug(f"Saved {len(staged)} files via rsync to {self.hostname}:{self.remote_path}")
+    
+    def _save_over_channels(self, items: List[Tuple[str, Union[str, bytes, BinaryIO]]], channels: int) -> None:
+        """Save items spread over several SFTP channels of the one SSH connection."""
+        # create the directories up front on the main channel, workers racing
+        # to mkdir the same directory would fail
+        for file_path, _ in items:
+            self._ensure_parent_directory(self._full_remote_path(file_path))
+        
+        def save_slice(sftp_client, batch):
+            for file_path, content in batch:
+                self._write(sftp_client, file_path, content)
+        
+        # paramiko's SFTP client isn't thread safe, so each worker gets its own
+        clients = [self.sftp_client] + [self.ssh_client.open_sftp() for _ in range(channels - 1)]
+        try:
+            with ThreadPoolExecutor(max_workers=channels) as executor:
+                futures = [executor.submit(save_slice, client, items[i::channels])
+                           for i, client in enumerate(clients)]
+                for future in futures:
+                    future.result()
         except Exception as e:
             logger.error(f"Error saving via SFTP: {str(e)}")
             raise
+        finally:
+            for client in clients[1:]:
+                client.close()
+    
+    async def save_many_async(self, items: Iterable[Tuple[str, Union[str, bytes, BinaryIO]]],
+                              max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> None:
+        """
+        Save several files via SFTP without blocking the event loop.
+        
+        Batches save_files would push with rsync go that way, otherwise the
+        files are spread over up to MAX_SFTP_CHANNELS SFTP channels on the
+        existing SSH connection, written from one worker thread per channel.
+        
+        Args:
+            items: (file_path, content) pairs
+            max_concurrency: Maximum number of channels to write on at once
+        """
+        items = list(items)
+        channels = max(1, min(max_concurrency, MAX_SFTP_CHANNELS, len(items)))
+        if channels == 1 or (len(items) >= RSYNC_MIN_FILES and self._rsync_command()):
+            await asyncio.to_thread(self.save_files, items)
+        else:
+            await asyncio.to_thread(self._save_over_channels, items, channels)
+    
+    def append_file(self, file_path: str, content: Union[str, bytes]) -> None:
+        """
+        Append content to a remote file by opening it in append mode.
+        
+        Args:
+            file_path: Relative path where the file should be appended
+            content: Content to append (string or bytes)
+        """
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        
+        try:
+            full_remote_path = self._full_remote_path(file_path)
+            self._ensure_parent_directory(full_remote_path)
+            with self.sftp_client.open(full_remote_path, 'ab') as remote_file:
+                remote_file.set_pipelined(True)
+                remote_file.write(data)
+            self._mark_saved(file_path)
+            logger.debug(f"Appended via SFTP: {full_remote_path}")
+        except Exception as e:
+            logger.error(f"Error appending via SFTP: {str(e)}")
+            raise
     
     def exists(self, file_path: str) -> bool:
         """
@@ -134,6 +369,10 @@ class SFTPStorageBackend(StorageBackend):
         Returns:
             True if file exists, False otherwise
         """
+        cached = self._cached_exists(file_path)
+        if cached is not None:
+            return cached
+        
         try:
             if self.remote_path:
                 full_remote_path = f"{self.remote_path}/{file_path}"
@@ -142,6 +381,9 @@ class SFTPStorageBackend(StorageBackend):
             
             self.sftp_client.stat(full_remote_path)
             return True
+        except FileNotFoundError:
+            self._mark_missing(file_path)
+            return False
         except IOError:
             return False
     
@@ -155,6 +397,10 @@ class SFTPStorageBackend(StorageBackend):
         Returns:
             File content as bytes, or None if not found
         """
+        content = self._cached_content(file_path)
+        if content is not None:
+            return content
+        
         try:
             if self.remote_path:
                 full_remote_path = f"{self.remote_path}/{file_path}"
@@ -162,20 +408,22 @@ class SFTPStorageBackend(StorageBackend):
                 full_remote_path = file_path
             
             with self.sftp_client.open(full_remote_path, 'rb') as remote_file:
-                return remote_file.read()
+                # request every chunk up front instead of one read round trip
+                # per 32KB block
+                remote_file.prefetch()
+                content = remote_file.read()
+            self._remember_content(file_path, content)
+            return content
         except IOError:
             return None
         except Exception as e:
             logger.error(f"Error reading file via SFTP: {str(e)}")
             return None
     
-    def __del__(self):
-        """Clean up SFTP connection."""
-        try:
-            if hasattr(self, 'sftp_client'):
-                self.sftp_client.close()
-            if hasattr(self, 'ssh_client'):
-                self.ssh_client.close()
-        except Exception:
-            pass
+    def close(self) -> None:
+        """Close the SFTP channel and the SSH connection (and the one rsync shares)."""
+        self._finalizer()
+        if hasattr(self, '_rsync_finalizer'):
+            self._rsync_finalizer()
+        super().close()
 
@@ -1,11 +1,72 @@
 import os
-from urllib.parse import urlparse
+import re
+import functools
+from urllib.parse import urlparse, ParseResult
 import logging
-from typing import Set, Union, Collection
+from typing import Set, Union, Collection, Tuple
 
 logger = logging.getLogger('DocuCrawler')
 
 NON_HTML_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.pdf', '.zip', '.js', '.css', '.svg', '.ico', '.woff', '.woff2', '.ttf', '.eot']
+# the extensions above as one case-insensitive match at the end of a path
+_NON_HTML_RE = re.compile('(?:' + '|'.join(map(re.escape, NON_HTML_EXTENSIONS)) + r')\Z', re.IGNORECASE)
+
+# a scheme as urlsplit accepts it, followed by the '//' of a netloc
+_SCHEME_RE = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*://')
+
+def _is_plain_url(url: str) -> bool:
+    """Check url has a well formed scheme and none of the tab/newline characters urlsplit strips out."""
+    return _SCHEME_RE.match(url) is not None and '\t' not in url and '\n' not in url and '\r' not in url
+
+@functools.lru_cache(maxsize=4096)
+def cached_urlparse(url: str) -> ParseResult:
+    """
+    Memoized urlparse.
+    
+    The same URL is parsed for validation, robots.txt checks and file path
+    mapping, so keep recent results around. ParseResult is an immutable
+    namedtuple, so sharing it is safe.
+    """
+    return urlparse(url)
+
+@functools.lru_cache(maxsize=4096)
+def split_netloc_path(url: str) -> Tuple[str, str]:
+    """
+    Get the (netloc, path) urlparse would give for url, without building a ParseResult.
+    
+    Plain absolute URLs, which is what the crawler sees, are split with a few
+    str.find calls. Anything unusual (no scheme, a scheme with odd characters,
+    tabs or newlines, ;params) goes through cached_urlparse so the result is
+    always the same.
+    Memoized like cached_urlparse, is_valid_url and url_to_filepath are called
+    for the same URL one after the other.
+    """
+    if _is_plain_url(url):
+        start = url.find('://') + 3
+        end = len(url)
+        query = url.find('?', start)
+        if query != -1:
+            end = query
+        fragment = url.find('#', start, end)
+        if fragment != -1:
+            end = fragment
+        slash = url.find('/', start, end)
+        if slash == -1:
+            return url[start:end], ''
+        path = url[slash:end]
+        if ';' not in path:
+            return url[start:slash], path
+    
+    parsed = cached_urlparse(url)
+    return parsed.netloc, parsed.path
+
+@functools.lru_cache(maxsize=64)
+def _base_prefixes(base_domain: str, base_path: str) -> Tuple[str, ...]:
+    """URL prefixes that put a URL on base_domain under base_path, empty if base_path can't anchor one."""
+    # without a leading '/' the prefix could end in the middle of a host name
+    if not base_path.startswith('/'):
+        return ()
+    return (f"https://{base_domain}{base_path}", f"http://{base_domain}{base_path}")
 
 def is_valid_url(url: str, base_domain: str, base_path: str) -> bool:
     """
@@ -19,26 +80,43 @@ def is_valid_url(url: str, base_domain: str, base_path: str) -> bool:
     Returns:
         True if the URL is valid, False otherwise
     """
-    parsed_url = urlparse(url)
+    # most links point inside the docs, those only need the extension check
+    if url.startswith(_base_prefixes(base_domain, base_path)) and ';' not in url and _is_plain_url(url):
+        end = len(url)
+        query = url.find('?')
+        if query != -1:
+            end = query
+        fragment = url.find('#', 0, end)
+        if fragment != -1:
+            end = fragment
+        if _NON_HTML_RE.search(url, 0, end):
+            logger.debug(f"Skipping non-HTML file: {url}")
+            return False
+        return True
+    
+    netloc, path = split_netloc_path(url)
     
-    if parsed_url.netloc != base_domain:
+    if netloc != base_domain:
         logger.debug(f"Skipping external domain: {url}")
         return False
     
-    if not parsed_url.path.startswith(base_path):
+    if not path.startswith(base_path):
         logger.debug(f"Skipping outside base path: {url}")
         return False
     
-    if any(parsed_url.path.lower().endswith(ext) for ext in NON_HTML_EXTENSIONS):
+    if _NON_HTML_RE.search(path):
         logger.debug(f"Skipping non-HTML file: {url}")
         return False
         
     return True
 
+@functools.lru_cache(maxsize=8192)
 def url_to_filepath(url: str, base_path: str, output_dir: str) -> str:
     """
     Convert a URL to a relative file path (without output_dir).
     
+    Memoized, the result only depends on the arguments.
+    
     Args:
         url: The URL to convert
         base_path: The base path to remove from the URL path
@@ -47,25 +125,21 @@ def url_to_filepath(url: str, base_path: str, output_dir: str) -> str:
     Returns:
         Relative file path (without output_dir prefix)
     """
-    parsed_url = urlparse(url)
-    path = parsed_url.path
-    
-    if path.startswith(base_path):
-        path = path[len(base_path):]
-    
-    if path.endswith('/'):
-        path = path + 'index'
-    
-    if path.startswith('/'):
-        path = path[1:]
+    path = split_netloc_path(url)[1]
     
-    if not path or path == '':
-        path = 'index'
+    # work out where the relative part starts, then slice once
+    start = len(base_path) if path.startswith(base_path) else 0
+    if path.startswith('/', start):
+        start += 1
     
-    if not path.endswith('.md'):
-        path += '.md'
+    if start == len(path) or path.endswith('/'):
+        tail = 'index.md'
+    elif path.endswith('.md'):
+        tail = ''
+    else:
+        tail = '.md'
     
-    return path
+    return path[start:] + tail
 
 def should_add_to_queue(url: str, visited_urls: Set[str], urls_in_queue: Set[str]) -> bool:
     """
@@ -0,0 +1,71 @@
+"""Tests for command line parsing."""
+import io
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from src.utils.cli import parse_args, _build_parser, _STORAGE_GROUPS
+
+
+def _full_parser():
+    return _build_parser(tuple(range(len(_STORAGE_GROUPS))))
+
+
+def _run(parse, argv):
+    """Parse argv, returning the namespace or the exit code and output."""
+    out, err = io.StringIO(), io.StringIO()
+    try:
+        with redirect_stdout(out), redirect_stderr(err):
+            return parse(argv)
+    except SystemExit as e:
+        return e.code, out.getvalue(), err.getvalue()
+
+
+class TestParseArgs(unittest.TestCase):
+    """Test cases for parse_args building the storage groups on demand."""
+
+    def assert_matches_full_parser(self, argv):
+        with self.subTest(argv=argv):
+            self.assertEqual(_run(parse_args, argv), _run(_full_parser().parse_args, argv))
+
+    def test_namespace_matches_full_parser(self):
+        """Test the namespace is what the parser with every group would produce."""
+        for argv in (
+            [],
+            ['https://example.com'],
+            ['https://example.com', '--delay', '0.5', '--single-file'],
+            ['https://example.com', '--p', 'proj'],
+            ['--storage-type', 's3', '--s3-r', 'eu-west-1'],
+            ['--s3-bucket=docs', '--stor=s3'],
+            ['--sftp-port=2222', '--sftp-h', 'host'],
+            ['--azure-cont', 'docs', '--azure-conn=secret'],
+            ['--use-gcs', '--b', 'bucket', '--cred', 'creds.json'],
+            ['--', '--s3-bucket'],
+        ):
+            self.assert_matches_full_parser(argv)
+
+    def test_errors_match_full_parser(self):
+        """Test rejected command lines exit with the full parser's usage and message."""
+        for argv in (
+            ['--s', 'x'],
+            ['--azure-c', 'x'],
+            ['--s3-bucket'],
+            ['--storage-type', 'ftp'],
+            ['--sftp-port', 'abc'],
+            ['--bogus'],
+            ['a', 'b'],
+        ):
+            self.assert_matches_full_parser(argv)
+        code, _, err = _run(parse_args, ['--bogus'])
+        self.assertEqual(code, 2)
+        self.assertIn('--sftp-host', err)
+
+    def test_help_matches_full_parser(self):
+        """Test -h and abbreviations of --help print every storage option."""
+        for argv in (['-h'], ['--help'], ['--he'], ['https://example.com', '-h']):
+            self.assert_matches_full_parser(argv)
+        code, out, _ = _run(parse_args, ['-h'])
+        self.assertEqual(code, 0)
+        self.assertIn('--azure-connection-string', out)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Tests for config loading."""
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from src.utils import config as config_module
+from src.utils.config import load_config
+
+
+class TestConfigCache(unittest.TestCase):
+    """Test cases for the parsed config cache next to the yaml file."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.temp_dir, 'crawler_config.yaml')
+        self.cache_path = self.config_path + '.cache.pkl'
+        with open(self.config_path, 'w') as f:
+            f.write('delay: 1\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_cache_hit(self):
+        """Test a second load comes from the cache without importing yaml."""
+        self.assertEqual(load_config(self.config_path), {'delay': 1})
+        self.assertTrue(os.path.exists(self.cache_path))
+        with mock.patch.object(config_module, '_import_yaml') as import_yaml:
+            self.assertEqual(load_config(self.config_path), {'delay': 1})
+        import_yaml.assert_not_called()
+
+    def test_invalidated_by_edit(self):
+        """Test editing the yaml file makes the next load parse it again."""
+        load_config(self.config_path)
+        with open(self.config_path, 'w') as f:
+            f.write('delay: 25\n')
+        self.assertEqual(load_config(self.config_path), {'delay': 25})
+        self.assertEqual(load_config(self.config_path), {'delay': 25})
+
+    def test_corrupt_cache(self):
+        """Test an unreadable cache falls back to parsing the yaml."""
+        load_config(self.config_path)
+        with open(self.cache_path, 'wb') as f:
+            f.write(b'not a pickle')
+        self.assertEqual(load_config(self.config_path), {'delay': 1})
+
+    def test_read_only_directory(self):
+        """Test the config still loads when the cache can't be written."""
+        with mock.patch('tempfile.mkstemp', side_effect=PermissionError('read-only')):
+            self.assertEqual(load_config(self.config_path), {'delay': 1})
+        self.assertFalse(os.path.exists(self.cache_path))
+
+    def test_untrusted_cache_ignored(self):
+        """Test a cache others can write, or owned by someone else, is never unpickled."""
+        source_stat = os.stat(self.config_path)
+        payload = {'mtime_ns': source_stat.st_mtime_ns, 'size': source_stat.st_size,
+                   'config': {'delay': 99}}
+        with open(self.cache_path, 'wb') as f:
+            pickle.dump(payload, f)
+        os.chmod(self.cache_path, 0o600)
+        self.assertEqual(load_config(self.config_path), {'delay': 99})
+
+        os.chmod(self.cache_path, 0o666)
+        self.assertEqual(load_config(self.config_path), {'delay': 1})
+
+        with open(self.cache_path, 'wb') as f:
+            pickle.dump(payload, f)
+        os.chmod(self.cache_path, 0o600)
+        with mock.patch('os.getuid', return_value=os.getuid() + 1):
+            self.assertEqual(load_config(self.config_path), {'delay': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
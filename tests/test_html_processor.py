@@ -93,5 +93,36 @@ class TestHtmlProcessor(unittest.TestCase):
         self.assertNotIn("Sidebar", markdown) # sidebar should be ignored if main content found
         self.assertNotIn("Footer", markdown) # footer is in ELEMENTS_TO_REMOVE
 
+    def test_code_block_language(self):
+        """Test code block language detection from code and pre classes."""
+        html = """
+        <html>
+            <head><title>Code</title></head>
+            <body>
+                <main>
+                    <pre><code class="language-python">print('hi')</code></pre>
+                    <pre class="brush:bash"><code>ls</code></pre>
+                </main>
+            </body>
+        </html>
+        """
+        processor = HtmlProcessor()
+        markdown = processor.extract_text(html)
+        self.assertIn("```python", markdown)
+        self.assertIn("```bash", markdown)
+
+    def test_extract_text_batch(self):
+        """Test batch conversion matches per-page conversion and keeps order."""
+        pages = [
+            (f"<html><head><title>Page {i}</title></head><body><main><p>Body {i}</p></main></body></html>",
+             f"https://example.com/{i}")
+            for i in range(4)
+        ]
+        config = HtmlProcessorConfig(include_frontmatter=True)
+        results = HtmlProcessor.extract_text_batch(pages, config, max_workers=2)
+        expected = [HtmlProcessor.extract_text_static(html, url, config) for html, url in pages]
+        self.assertEqual(results, expected)
+        self.assertEqual(HtmlProcessor.extract_text_batch([]), [])
+
 if __name__ == '__main__':
     unittest.main()
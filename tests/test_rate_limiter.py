@@ -0,0 +1,118 @@
+"""Tests for the rate limiters."""
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from src.utils.rate_limiter import RateLimiter, SimpleRateLimiter
+
+
+class _Clock:
+    """Fake time module, sleeps are recorded instead of advancing the clock."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+        self.lock = threading.Lock()
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        with self.lock:
+            self.sleeps.append(seconds)
+
+
+class _RateLimiterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = _Clock()
+        patcher = mock.patch('src.utils.rate_limiter.time',
+                             SimpleNamespace(monotonic=self.clock.monotonic, sleep=self.clock.sleep))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_concurrently(self, limiter, count, domain='example.com'):
+        threads = [threading.Thread(target=limiter.wait_if_needed, args=(domain,)) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return sorted(self.clock.sleeps)
+
+
+class TestSimpleRateLimiter(_RateLimiterTest):
+    """Test cases for SimpleRateLimiter."""
+
+    def test_concurrent_callers_spaced(self):
+        """Test callers arriving together each get their own slot, delay apart."""
+        limiter = SimpleRateLimiter(delay=0.5)
+        self.assertEqual(self.run_concurrently(limiter, 4), [0.5, 1.0, 1.5])
+
+    def test_delay_elapsed(self):
+        """Test no wait once the delay has passed, and domains don't share slots."""
+        limiter = SimpleRateLimiter(delay=1.0)
+        limiter.wait_if_needed('a.com')
+        limiter.wait_if_needed('b.com')
+        self.clock.now += 1.0
+        limiter.wait_if_needed('a.com')
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_evicts_least_recently_used(self):
+        """Test state is dropped for the least recently used domain past max_keys."""
+        limiter = SimpleRateLimiter(delay=1.0, max_keys=2)
+        limiter.wait_if_needed('a.com')
+        limiter.wait_if_needed('b.com')
+        self.clock.now += 0.5
+        limiter.wait_if_needed('a.com')
+        limiter.wait_if_needed('c.com')
+        self.assertEqual(list(limiter.next_allowed_time), ['a.com', 'c.com'])
+
+
+class TestRateLimiter(_RateLimiterTest):
+    """Test cases for the token bucket RateLimiter."""
+
+    def test_concurrent_callers_spaced(self):
+        """Test a burst uses the bucket, then callers queue one token interval apart."""
+        limiter = RateLimiter(rate=2.0, per=1.0)
+        self.assertEqual(self.run_concurrently(limiter, 5), [0.5, 1.0, 1.5])
+
+    def test_token_debt(self):
+        """Test reservations leave a negative balance that refills before the next free request."""
+        limiter = RateLimiter(rate=1.0, per=1.0)
+        for _ in range(3):
+            limiter.wait_if_needed('a.com')
+        self.assertEqual(self.clock.sleeps, [1.0, 2.0])
+        self.assertEqual(limiter.buckets['a.com'][0], -2.0)
+
+        self.clock.now += 2.5
+        limiter.wait_if_needed('a.com')
+        self.assertEqual(self.clock.sleeps[-1], 0.5)
+        self.clock.now += 10.0
+        limiter.wait_if_needed('a.com')
+        self.assertEqual(len(self.clock.sleeps), 3)
+        self.assertEqual(limiter.buckets['a.com'][0], 0.0)
+
+    def test_global_key(self):
+        """Test per_domain=False shares one bucket across domains."""
+        limiter = RateLimiter(rate=1.0, per=1.0, per_domain=False)
+        limiter.wait_if_needed('a.com')
+        limiter.wait_if_needed('b.com')
+        self.assertEqual(self.clock.sleeps, [1.0])
+        self.assertEqual(list(limiter.buckets), ['global'])
+
+    def test_evicts_least_recently_used(self):
+        """Test bucket state is dropped for the least recently used domain past max_keys."""
+        limiter = RateLimiter(rate=1.0, per=1.0, max_keys=2)
+        limiter.wait_if_needed('a.com')
+        limiter.wait_if_needed('b.com')
+        limiter.wait_if_needed('a.com')
+        limiter.wait_if_needed('c.com')
+        self.assertEqual(list(limiter.buckets), ['a.com', 'c.com'])
+        # b.com starts over with a full bucket
+        sleeps = len(self.clock.sleeps)
+        limiter.wait_if_needed('b.com')
+        self.assertEqual(len(self.clock.sleeps), sleeps)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Tests for the retry decorators."""
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from src.utils.retry import retry_with_backoff, retry_on_http_error
+
+
+def _response(status_code, headers=None):
+    return SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+class TestAsyncRetry(unittest.TestCase):
+    """Test cases for the decorators wrapping coroutine functions."""
+
+    def setUp(self):
+        async_sleep = mock.patch('src.utils.retry.asyncio.sleep', new_callable=mock.AsyncMock)
+        time_sleep = mock.patch('src.utils.retry.time.sleep')
+        self.async_sleep = async_sleep.start()
+        self.time_sleep = time_sleep.start()
+        self.addCleanup(async_sleep.stop)
+        self.addCleanup(time_sleep.stop)
+
+    def tearDown(self):
+        # a blocking sleep would stall every other task on the loop
+        self.time_sleep.assert_not_called()
+
+    def test_retry_then_succeed(self):
+        """Test an exception is retried with growing asyncio.sleep delays."""
+        calls = []
+
+        @retry_with_backoff(max_retries=3, initial_delay=1.0, backoff_factor=2.0)
+        async def fetch():
+            calls.append(1)
+            if len(calls) < 3:
+                raise ConnectionError('reset')
+            return 'ok'
+
+        self.assertEqual(asyncio.run(fetch()), 'ok')
+        self.assertEqual(len(calls), 3)
+        self.assertEqual([c.args[0] for c in self.async_sleep.await_args_list], [1.0, 2.0])
+
+    def test_gives_up(self):
+        """Test the last exception is raised once the retries are used up."""
+        @retry_with_backoff(max_retries=2, initial_delay=0.5, retry_on=(ConnectionError,))
+        async def fetch():
+            raise ConnectionError('reset')
+
+        with self.assertRaises(ConnectionError):
+            asyncio.run(fetch())
+        self.assertEqual(self.async_sleep.await_count, 2)
+
+    def test_retry_on_503(self):
+        """Test a 503 response is retried and the next response returned."""
+        responses = [_response(503), _response(200)]
+
+        @retry_on_http_error(max_retries=3, initial_delay=1.5)
+        async def fetch():
+            return responses.pop(0)
+
+        self.assertEqual(asyncio.run(fetch()).status_code, 200)
+        self.async_sleep.assert_awaited_once_with(1.5)
+
+    def test_honours_retry_after(self):
+        """Test a numeric Retry-After header replaces the backoff delay."""
+        responses = [_response(429, {'Retry-After': '7'}), _response(429), _response(200)]
+
+        @retry_on_http_error(max_retries=3, initial_delay=1.0, backoff_factor=2.0)
+        async def fetch():
+            return responses.pop(0)
+
+        self.assertEqual(asyncio.run(fetch()).status_code, 200)
+        self.assertEqual([c.args[0] for c in self.async_sleep.await_args_list], [7.0, 14.0])
+
+    def test_http_exception_retried(self):
+        """Test exceptions raised by the request are retried too."""
+        outcomes = [TimeoutError('slow'), _response(200)]
+
+        @retry_on_http_error(max_retries=1)
+        async def fetch():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        self.assertEqual(asyncio.run(fetch()).status_code, 200)
+        self.assertEqual(self.async_sleep.await_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import tempfile
+import unittest
+from unittest.mock import Mock, MagicMock
+from src.utils.robots import RobotsTxtChecker
+
+ROBOTS_TXT = b"""
+User-agent: DocuCrawler
+Allow: /private/docs
+Disallow: /private
+
+User-agent: *
+Disallow: /admin
+Disallow: /tmp/
+"""
+
+class TestRobotsTxtChecker(unittest.TestCase):
+    """Test cases for RobotsTxtChecker."""
+
+    def setUp(self):
+        self.mock_session = MagicMock()
+        self.checker = RobotsTxtChecker(session=self.mock_session, cache_dir=None)
+        response = Mock()
+        response.status_code = 200
+        response.content = ROBOTS_TXT
+        response.headers = {'ETag': '"v1"'}
+        self.mock_session.get.return_value = response
+        self.mock_get = self.mock_session.get
+
+    def test_can_fetch_default_agent(self):
+        """Test rules for the catch-all user agent."""
+        self.assertFalse(self.checker.can_fetch("https://example.com/admin/users"))
+        self.assertFalse(self.checker.can_fetch("https://example.com/tmp/file"))
+        self.assertTrue(self.checker.can_fetch("https://example.com/tmp"))
+        self.assertTrue(self.checker.can_fetch("https://example.com/docs/page"))
+
+    def test_can_fetch_named_agent(self):
+        """Test that the first matching rule of the agent's own entry wins."""
+        user_agent = "DocuCrawler/1.0"
+        self.assertTrue(self.checker.can_fetch("https://example.com/private/docs/a", user_agent))
+        self.assertFalse(self.checker.can_fetch("https://example.com/private/other", user_agent))
+        self.assertTrue(self.checker.can_fetch("https://example.com/admin", user_agent))
+
+    def test_can_fetch_many(self):
+        """Test bulk checks keep input order and match can_fetch."""
+        urls = [
+            "https://example.com/admin",
+            "https://other.org/admin",
+            "https://example.com/docs",
+            "https://example.com/tmp/x",
+        ]
+        self.assertEqual(self.checker.can_fetch_many(urls), [False, False, True, False])
+        self.assertEqual(self.mock_get.call_count, 2)
+
+    def test_robots_fetched_once_per_domain(self):
+        """Test robots.txt is cached between checks."""
+        self.checker.can_fetch("https://example.com/a")
+        self.checker.can_fetch("https://example.com/b", "DocuCrawler")
+        self.assertEqual(self.mock_get.call_count, 1)
+
+    def test_non_http_urls_skip_fetch(self):
+        """Test non-http and malformed urls are allowed without fetching robots.txt."""
+        self.assertTrue(self.checker.can_fetch("file:///etc/passwd"))
+        self.assertTrue(self.checker.can_fetch("mailto:someone@example.com"))
+        self.assertTrue(self.checker.can_fetch("/relative/path"))
+        self.assertIsNone(self.checker.get_crawl_delay("javascript:void(0)"))
+        self.mock_get.assert_not_called()
+
+    def test_refresh_not_modified(self):
+        """Test an expired cache revalidates with the ETag and keeps rules on 304."""
+        self.assertFalse(self.checker.can_fetch("https://example.com/admin"))
+        self.checker.cache_time["https://example.com"] = 0
+
+        not_modified = Mock()
+        not_modified.status_code = 304
+        self.mock_get.return_value = not_modified
+
+        self.assertFalse(self.checker.can_fetch("https://example.com/admin"))
+        headers = self.mock_get.call_args.kwargs['headers']
+        self.assertEqual(headers['If-None-Match'], '"v1"')
+
+    def test_disk_cache_shared_between_instances(self):
+        """Test a fresh checker reuses robots.txt persisted by an earlier one."""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = RobotsTxtChecker(session=self.mock_session, cache_dir=cache_dir)
+            self.assertFalse(first.can_fetch("https://example.com/admin"))
+
+            second = RobotsTxtChecker(session=self.mock_session, cache_dir=cache_dir)
+            self.assertFalse(second.can_fetch("https://example.com/admin"))
+            self.assertTrue(second.can_fetch("https://example.com/docs"))
+            self.assertEqual(self.mock_get.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
+import gzip
+import threading
 import unittest
 from unittest.mock import Mock, MagicMock
 import xml.etree.ElementTree as ET
+import requests
 from src.utils.sitemap import SitemapParser
 
 class TestSitemapParser(unittest.TestCase):
@@ -34,6 +37,7 @@ class TestSitemapParser(unittest.TestCase):
         mock_response = Mock()
         mock_response.text = "<urlset><url><loc>http://example.com/subpage</loc></url></urlset>"
         mock_response.content = mock_response.text.encode('utf-8')
+        mock_response.iter_content = Mock(side_effect=lambda chunk_size: iter([mock_response.content]))
         mock_response.status_code = 200
         self.mock_session.get.return_value = mock_response
 
@@ -50,9 +54,104 @@ class TestSitemapParser(unittest.TestCase):
         self.parser._parse_index(xml_content, urls, visited, max_depth)
         
         # verify sub-sitemap was fetched
-        self.mock_session.get.assert_called_with("http://example.com/sitemap1.xml", timeout=30)
+        self.mock_session.get.assert_called_with("http://example.com/sitemap1.xml", timeout=30, stream=True)
         self.assertIn("http://example.com/subpage", urls)
 
+    def test_fetch_urls_streamed(self):
+        """Test a urlset split across arbitrary chunks is parsed while streaming."""
+        content = (b'<?xml version="1.0" encoding="UTF-8"?>'
+                   b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                   + b''.join(b'<url><loc>http://example.com/p%d</loc></url>' % i for i in range(50))
+                   + b'</urlset>')
+        chunks = [content[i:i + 37] for i in range(0, len(content), 37)]
+        mock_response = Mock()
+        mock_response.iter_content = Mock(return_value=iter(chunks))
+        self.mock_session.get.return_value = mock_response
+
+        urls = self.parser.fetch_urls("http://example.com/sitemap.xml")
+        self.assertEqual(len(urls), 50)
+        self.assertIn("http://example.com/p49", urls)
+        mock_response.close.assert_called_once()
+
+    def test_fetch_urls_gzipped(self):
+        """Test a gzip-compressed sitemap.xml.gz body is decompressed while streaming."""
+        content = gzip.compress(b'<?xml version="1.0" encoding="UTF-8"?>'
+                                b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                                b'<url><loc>http://example.com/a</loc></url>'
+                                b'<url><loc>http://example.com/b</loc></url>'
+                                b'</urlset>')
+        mock_response = Mock()
+        mock_response.iter_content = Mock(return_value=iter([content[:1], content[1:20], content[20:]]))
+        self.mock_session.get.return_value = mock_response
+
+        urls = self.parser.fetch_urls("http://example.com/sitemap.xml.gz")
+        self.assertEqual(sorted(urls), ["http://example.com/a", "http://example.com/b"])
+
+    def test_fetch_urls_cached(self):
+        """Test a sitemap fetched once is served from the cache on the next call."""
+        content = (b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                   b'<url><loc>http://example.com/a</loc></url></urlset>')
+        mock_response = Mock()
+        mock_response.iter_content = Mock(side_effect=lambda **kwargs: iter([content]))
+        self.mock_session.get.return_value = mock_response
+
+        first = self.parser.fetch_urls("http://example.com/sitemap.xml")
+        second = self.parser.fetch_urls("http://example.com/sitemap.xml")
+        self.assertEqual(first, ["http://example.com/a"])
+        self.assertEqual(second, first)
+        self.assertEqual(self.mock_session.get.call_count, 1)
+
+    def test_partial_index_not_cached(self):
+        """Test an index whose sub-sitemap failed is fetched again on the next call."""
+        index = (b'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                 b'<sitemap><loc>http://example.com/a.xml</loc></sitemap>'
+                 b'<sitemap><loc>http://example.com/b.xml</loc></sitemap></sitemapindex>')
+        urlset = b'<urlset><url><loc>http://example.com/page</loc></url></urlset>'
+
+        def get(url, **kwargs):
+            if url.endswith("b.xml"):
+                raise requests.exceptions.ConnectionError("down")
+            response = Mock()
+            response.iter_content = Mock(return_value=iter([index if url.endswith("index.xml") else urlset]))
+            return response
+        self.mock_session.get.side_effect = get
+
+        self.assertEqual(self.parser.fetch_urls("http://example.com/index.xml"), ["http://example.com/page"])
+        self.parser.fetch_urls("http://example.com/index.xml")
+        fetched = [call.args[0] for call in self.mock_session.get.call_args_list]
+        self.assertEqual(fetched.count("http://example.com/index.xml"), 2)
+        # the sub-sitemap that did work is served from the cache
+        self.assertEqual(fetched.count("http://example.com/a.xml"), 1)
+
+    def test_nested_indexes_fan_out_once(self):
+        """Test only the first index level is fetched in parallel, deeper levels stay in that worker."""
+        ns = b'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+        bodies = {"http://example.com/root.xml": b'<sitemapindex ' + ns + b'>'
+                  + b''.join(b'<sitemap><loc>http://example.com/idx%d.xml</loc></sitemap>' % i for i in range(3))
+                  + b'</sitemapindex>'}
+        for i in range(3):
+            bodies[f"http://example.com/idx{i}.xml"] = (
+                b'<sitemapindex ' + ns + b'>'
+                + b''.join(b'<sitemap><loc>http://example.com/s%d-%d.xml</loc></sitemap>' % (i, j) for j in range(3))
+                + b'</sitemapindex>')
+            for j in range(3):
+                bodies[f"http://example.com/s{i}-{j}.xml"] = (
+                    b'<urlset ' + ns + b'><url><loc>http://example.com/p%d-%d</loc></url></urlset>' % (i, j))
+        threads = {}
+
+        def get(url, **kwargs):
+            threads[url] = threading.get_ident()
+            response = Mock()
+            response.iter_content = Mock(return_value=iter([bodies[url]]))
+            return response
+        self.mock_session.get.side_effect = get
+
+        urls = self.parser.fetch_urls("http://example.com/root.xml")
+        self.assertEqual(len(urls), 9)
+        for i in range(3):
+            for j in range(3):
+                self.assertEqual(threads[f"http://example.com/s{i}-{j}.xml"], threads[f"http://example.com/idx{i}.xml"])
+
     def test_malformed_xml(self):
         """Test handling of malformed XML."""
         urls = set()
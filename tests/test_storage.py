@@ -1,8 +1,15 @@
 """Tests for storage backends."""
+import asyncio
+import gzip
+import io
 import unittest
 import tempfile
 import os
 from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+from src.utils.storage import StorageClient, get_storage_backend, close_storage_backends
+from src.utils.storage.base import StorageBackend
 from src.utils.storage.local import LocalStorageBackend
 
 
@@ -33,6 +40,16 @@ class TestLocalStorageBackend(unittest.TestCase):
         self.assertTrue(file_path.exists())
         self.assertEqual(file_path.read_bytes(), b"Test bytes")
     
+    def test_save_file_from_file(self):
+        """Test saving the rest of an open file."""
+        source_path = Path(self.temp_dir) / "source.bin"
+        source_path.write_bytes(b"skip:" + b"x" * 100000)
+        with open(source_path, "rb") as source:
+            source.read(5)
+            self.storage.save_file("copy.bin", source)
+            self.assertEqual(source.tell(), 100005)
+        self.assertEqual(self.storage.get_file("copy.bin"), b"x" * 100000)
+
     def test_save_file_nested_path(self):
         """Test saving file in nested directory."""
         self.storage.save_file("nested/path/test.md", "Content")
@@ -45,6 +62,15 @@ class TestLocalStorageBackend(unittest.TestCase):
         self.assertTrue(self.storage.exists("test.md"))
         self.assertFalse(self.storage.exists("nonexistent.md"))
     
+    def test_exists_many(self):
+        """Test batch existence checks across directories."""
+        self.storage.save_file("a.md", "A")
+        self.storage.save_file("docs/b.md", "B")
+        self.assertEqual(
+            self.storage.exists_many(["a.md", "docs/b.md", "docs/c.md", "missing/d.md"]),
+            {"a.md": True, "docs/b.md": True, "docs/c.md": False, "missing/d.md": False},
+        )
+
     def test_get_file(self):
         """Test retrieving file content."""
         self.storage.save_file("test.md", "Content")
@@ -71,6 +97,11 @@ class TestLocalStorageBackend(unittest.TestCase):
         self.assertFalse(path_str.startswith('/'))
         self.assertFalse(path_str.startswith('\\'))
 
+    def test_sanitize_path_hidden_parent(self):
+        """Test special characters can't smuggle a '..' component past sanitization."""
+        self.assertNotIn("..", self.storage._sanitize_path("..<").parts)
+        self.assertNotIn("..", self.storage._sanitize_path("docs/..?/../secret").parts)
+
     def test_append_file(self):
         """Test appending content to a file."""
         self.storage.save_file("append.md", "Initial content")
@@ -85,7 +116,463 @@ class TestLocalStorageBackend(unittest.TestCase):
         content = self.storage.get_file("new_append.md")
         self.assertEqual(content.decode('utf-8'), "Start content")
 
+    def test_save_files(self):
+        """Test saving several files in one call."""
+        self.storage.save_files([("a.md", "A"), ("nested/b.bin", b"B")])
+        self.assertEqual(self.storage.get_file("a.md"), b"A")
+        self.assertEqual(self.storage.get_file("nested/b.bin"), b"B")
+
+    def test_save_many_async(self):
+        """Test the threaded async default saves every file."""
+        items = [(f"docs/{i}.md", f"Page {i}") for i in range(20)]
+        asyncio.run(self.storage.save_many_async(items, max_concurrency=4))
+        for i in range(20):
+            self.assertEqual(self.storage.get_file(f"docs/{i}.md"), f"Page {i}".encode())
+
+    def test_local_backend_not_memoized(self):
+        """Test local backends are built fresh, re-creating a removed output directory."""
+        import shutil
+        output = os.path.join(self.temp_dir, "out")
+        StorageClient(output_dir=output).save_file("a.md", "x")
+        shutil.rmtree(output)
+        StorageClient(output_dir=output).save_file("b.md", "y")
+        self.assertTrue(os.path.exists(os.path.join(output, "b.md")))
+
+    def test_context_manager(self):
+        """Test a backend can be used as a context manager."""
+        with LocalStorageBackend(self.temp_dir) as storage:
+            storage.save_file("ctx.md", "x")
+        self.assertTrue(self.storage.exists("ctx.md"))
+
+
+
+class _MemoryBackend(StorageBackend):
+    """Remote-style backend over a dict, counting round trips."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.files = {}
+        self.remote_calls = 0
+
+    def save_file(self, file_path, content):
+        self.files[file_path] = content
+        self._mark_saved(file_path)
+
+    def exists(self, file_path):
+        cached = self._cached_exists(file_path)
+        if cached is not None:
+            return cached
+        self.remote_calls += 1
+        if file_path in self.files:
+            return True
+        self._mark_missing(file_path)
+        return False
+
+    def get_file(self, file_path):
+        content = self._cached_content(file_path)
+        if content is not None:
+            return content
+        self.remote_calls += 1
+        content = self.files.get(file_path)
+        if content is not None:
+            self._remember_content(file_path, content)
+        return content
+
+
+class TestStorageBackendCaches(unittest.TestCase):
+    """Test cases for the exists/content caches in StorageBackend."""
+
+    def test_exists_cached(self):
+        """Test saved paths and recent misses don't go to the remote."""
+        backend = _MemoryBackend()
+        self.assertFalse(backend.exists("a.md"))
+        self.assertFalse(backend.exists("a.md"))
+        self.assertEqual(backend.remote_calls, 1)
+
+        backend.save_file("a.md", b"A")
+        self.assertTrue(backend.exists("a.md"))
+        self.assertEqual(backend.remote_calls, 1)
+
+    def test_read_cache_invalidated_by_save(self):
+        """Test get_file results are cached until the path is written again."""
+        backend = _MemoryBackend()
+        backend.save_file("a.md", b"one")
+        self.assertIsNone(backend._cached_content("a.md"))
+        self.assertEqual(backend.get_file("a.md"), b"one")
+        self.assertEqual(backend.get_file("a.md"), b"one")
+        self.assertEqual(backend.remote_calls, 1)
+        backend.append_file("a.md", b" two")
+        self.assertIsNone(backend._cached_content("a.md"))
+        self.assertEqual(backend.get_file("a.md"), b"one two")
+        self.assertEqual(backend.remote_calls, 2)
+
+    def test_exists_many_by_listing(self):
+        """Test paths sharing a prefix are answered by one listing."""
+        backend = _MemoryBackend()
+        backend.files = {"docs/a.md": b"A", "docs/b.md": b"B"}
+        listed = []
+
+        def list_names(prefix):
+            listed.append(prefix)
+            return {name for name in backend.files if name.startswith(prefix)}
+
+        results = backend._exists_many_by_listing(["docs/a.md", "docs/b.md", "docs/c.md"], list_names)
+        self.assertEqual(results, {"docs/a.md": True, "docs/b.md": True, "docs/c.md": False})
+        self.assertEqual(listed, ["docs/"])
+        self.assertEqual(backend.remote_calls, 0)
+        self.assertFalse(backend.exists("docs/c.md"))
+        self.assertEqual(backend.remote_calls, 0)
+
+    def test_closed_backend_not_handed_out(self):
+        """Test the factory rebuilds a memoized remote backend once it was closed."""
+        config = {'storage_type': 's3', 's3_bucket': 'docs'}
+        with mock.patch('src.utils.storage._create_storage_backend', side_effect=lambda c: _MemoryBackend()):
+            backend = get_storage_backend(config)
+            self.assertIs(get_storage_backend(config), backend)
+            with get_storage_backend(config) as b:
+                b.save_file("a", b"1")
+            self.assertTrue(backend.closed)
+            fresh = get_storage_backend(config)
+            self.assertIsNot(fresh, backend)
+            close_storage_backends()
+            self.assertTrue(fresh.closed)
+            self.assertIsNot(get_storage_backend(config), fresh)
+            close_storage_backends()
+
+    def test_content_cache_bounded_by_bytes(self):
+        """Test least recently used contents are evicted past the byte budget."""
+        backend = _MemoryBackend(read_cache_bytes=10)
+        backend.files = {"a": b"12345", "b": b"12345", "c": b"12345"}
+        backend.get_file("a")
+        backend.get_file("b")
+        backend.get_file("a")
+        backend.get_file("c")
+        self.assertIsNotNone(backend._cached_content("a"))
+        self.assertIsNone(backend._cached_content("b"))
+        self.assertEqual(backend._contents_size, 10)
+
+
+class _NotFound(Exception):
+    """Stands in for the SDKs' not found errors."""
+
+
+class _HttpResponseError(Exception):
+    """Stands in for azure.core's HttpResponseError."""
+
+    def __init__(self, error_code):
+        super().__init__(error_code)
+        self.error_code = error_code
+
+
+class _ContentSettings(SimpleNamespace):
+    """azure.storage.blob.ContentSettings, unset fields are None."""
+
+    def __init__(self, content_type=None, content_encoding=None):
+        super().__init__(content_type=content_type, content_encoding=content_encoding)
+
+
+class _FakeAzureBlob:
+    """Blob client over a shared dict, decoding gzip on download like the SDK does by default."""
+
+    def __init__(self, blobs, name):
+        self.blobs = blobs
+        self.name = name
+        self.uploads = 0
+
+    def _blob(self):
+        if self.name not in self.blobs:
+            raise _NotFound(self.name)
+        return self.blobs[self.name]
+
+    def upload_blob(self, data, overwrite=False, max_concurrency=1, content_settings=None, metadata=None):
+        self.uploads += 1
+        self.blobs[self.name] = {'data': data, 'settings': content_settings,
+                                 'metadata': metadata or {}, 'append': False}
+
+    def get_blob_properties(self):
+        blob = self._blob()
+        return SimpleNamespace(metadata=blob['metadata'], content_settings=blob['settings'])
+
+    def download_blob(self, max_concurrency=1, decompress=True):
+        blob = self._blob()
+        data = blob['data']
+        if decompress and blob['settings'].content_encoding == 'gzip':
+            data = gzip.decompress(data)
+        return SimpleNamespace(readall=lambda: data, properties=self.get_blob_properties())
+
+    def exists(self):
+        return self.name in self.blobs
+
+    def create_append_blob(self, content_settings=None):
+        self.blobs[self.name] = {'data': b'', 'settings': content_settings, 'metadata': {}, 'append': True}
+
+    def append_block(self, data):
+        blob = self._blob()
+        if not blob['append']:
+            raise _HttpResponseError('InvalidBlobType')
+        blob['data'] += data
+
+
+class _FakeAzureService:
+    """Service and container client in one, handing out _FakeAzureBlob clients."""
+
+    def __init__(self):
+        self.blobs = {}
+        self.clients = {}
+
+    def get_container_client(self, name):
+        return self
+
+    def get_container_properties(self):
+        return {}
+
+    def get_blob_client(self, name):
+        return self.clients.setdefault(name, _FakeAzureBlob(self.blobs, name))
+
+    def close(self):
+        pass
+
+
+class TestAzureBlobStorageBackend(unittest.TestCase):
+    """Test cases for AzureBlobStorageBackend against a mocked SDK."""
+
+    def setUp(self):
+        from src.utils.storage import azure_blob
+        self.service = _FakeAzureService()
+        service_class = mock.Mock()
+        service_class.from_connection_string.return_value = self.service
+        patcher = mock.patch.multiple(
+            azure_blob, create=True, AZURE_AVAILABLE=True, AZURE_AIO_AVAILABLE=False,
+            BlobServiceClient=service_class, ContentSettings=_ContentSettings,
+            ResourceNotFoundError=_NotFound, HttpResponseError=_HttpResponseError,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.backend = azure_blob.AzureBlobStorageBackend('docs', connection_string='conn')
+
+    def test_gzip_round_trip(self):
+        """Test large bodies are stored gzipped and read back as the original bytes."""
+        content = b'# Page\n' * 500
+        self.backend.save_file('page.md', content)
+        blob = self.service.blobs['page.md']
+        self.assertEqual(blob['settings'].content_encoding, 'gzip')
+        self.assertEqual(gzip.decompress(blob['data']), content)
+        self.assertEqual(self.backend.get_file('page.md'), content)
+
+        self.backend.save_file('small.md', b'tiny')
+        self.assertIsNone(self.service.blobs['small.md']['settings'].content_encoding)
+        self.assertEqual(self.backend.get_file('small.md'), b'tiny')
+
+    def test_append_to_compressed_blob(self):
+        """Test appending to a gzipped block blob rewrites it as a plain append blob."""
+        content = b'line\n' * 500
+        self.backend.save_file('log.md', content)
+        self.backend.append_file('log.md', 'more\n')
+        blob = self.service.blobs['log.md']
+        self.assertTrue(blob['append'])
+        self.assertEqual(blob['data'], content + b'more\n')
+        self.backend.append_file('log.md', b'again\n')
+        self.assertEqual(self.backend.get_file('log.md'), content + b'more\nagain\n')
+
+    def test_append_creates_missing_blob(self):
+        """Test appending to a missing blob creates it, even with nothing to append."""
+        self.backend.append_file('new.md', b'')
+        self.assertEqual(self.service.blobs['new.md']['data'], b'')
+        self.backend.append_file('other.md', 'start')
+        self.assertEqual(self.backend.get_file('other.md'), b'start')
+
+    def test_skip_unchanged(self):
+        """Test a save of the content the blob already holds is not uploaded."""
+        content = b'x' * 2000
+        self.backend.save_file('page.md', content)
+        fresh = type(self.backend)('docs', connection_string='conn')
+        fresh.save_file('page.md', content)
+        client = self.service.clients['page.md']
+        self.assertEqual(client.uploads, 1)
+        fresh.save_file('page.md', content + b'!')
+        self.assertEqual(client.uploads, 2)
+
+
+class _FakeGCSBlob:
+    """GCS blob over a shared dict, downloads decode gzip like the client library."""
+
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+        self.content_encoding = None
+        self.content_type = None
+        self.metadata = None
+
+    def upload_from_string(self, data, content_type=None):
+        self.bucket.uploads += 1
+        self.bucket.objects[self.name] = {'data': data, 'encoding': self.content_encoding,
+                                          'metadata': self.metadata or {}}
+
+    def download_as_bytes(self):
+        if self.name not in self.bucket.objects:
+            raise _NotFound(self.name)
+        stored = self.bucket.objects[self.name]
+        if stored['encoding'] == 'gzip':
+            return gzip.decompress(stored['data'])
+        return stored['data']
+
+    def compose(self, sources):
+        self.bucket.objects[self.name] = {
+            'data': b''.join(self.bucket.objects[source.name]['data'] for source in sources),
+            'encoding': None, 'metadata': {},
+        }
+
+    def delete(self):
+        self.bucket.objects.pop(self.name, None)
+
+    def exists(self):
+        return self.name in self.bucket.objects
+
+
+class _FakeGCSBucket:
+    """Bucket and client in one, keeping objects in a dict."""
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = 0
+        self._http = mock.Mock()
+
+    def bucket(self, name):
+        return self
+
+    def exists(self):
+        return True
+
+    def blob(self, name):
+        return _FakeGCSBlob(self, name)
+
+    def get_blob(self, name):
+        stored = self.objects.get(name)
+        if stored is None:
+            return None
+        blob = _FakeGCSBlob(self, name)
+        blob.content_encoding = stored['encoding']
+        blob.metadata = stored['metadata']
+        return blob
+
+
+class TestGCSStorageBackend(unittest.TestCase):
+    """Test cases for GCSStorageBackend against a mocked client."""
+
+    def setUp(self):
+        from src.utils.storage import gcs
+        self.bucket = _FakeGCSBucket()
+        patcher = mock.patch.multiple(
+            gcs, create=True, GCS_AVAILABLE=True, NotFound=_NotFound,
+            storage=SimpleNamespace(Client=lambda **kwargs: self.bucket),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.backend = gcs.GCSStorageBackend('docs')
+
+    def test_gzip_round_trip(self):
+        """Test large bodies are stored gzipped and read back as the original bytes."""
+        content = b'# Page\n' * 500
+        self.backend.save_file('page.md', content)
+        stored = self.bucket.objects['page.md']
+        self.assertEqual(stored['encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(stored['data']), content)
+        self.assertEqual(self.backend.get_file('page.md'), content)
+
+    def test_append_to_compressed_object(self):
+        """Test appending to a gzipped object rewrites it plain, then composes."""
+        content = b'line\n' * 500
+        self.backend.save_file('log.md', content)
+        self.backend.append_file('log.md', 'more\n')
+        self.assertIsNone(self.bucket.objects['log.md']['encoding'])
+        self.backend.append_file('log.md', b'again\n')
+        self.assertEqual(self.bucket.objects['log.md']['data'], content + b'more\nagain\n')
+        self.assertEqual(sorted(self.bucket.objects), ['log.md'])
+
+    def test_skip_unchanged(self):
+        """Test a save of the content the object already holds is not uploaded."""
+        content = b'x' * 2000
+        self.backend.save_file('page.md', content)
+        fresh = type(self.backend)('docs')
+        fresh.save_file('page.md', content)
+        self.assertEqual(self.bucket.uploads, 1)
+        fresh.save_file('page.md', content + b'!')
+        self.assertEqual(self.bucket.uploads, 2)
+
+
+class _ClientError(Exception):
+    """Stands in for botocore's ClientError."""
+
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {'Error': {'Code': code}}
+
+
+class _FakeS3Client:
+    """S3 client keeping objects in a dict."""
+
+    def __init__(self):
+        self.objects = {}
+        self.gets = 0
+
+    def head_bucket(self, Bucket):
+        return {}
+
+    def put_object(self, Bucket, Key, Body, ContentType, **kwargs):
+        self.objects[Key] = {'Body': Body, 'ContentEncoding': kwargs.get('ContentEncoding')}
+
+    def get_object(self, Bucket, Key):
+        self.gets += 1
+        if Key not in self.objects:
+            raise _ClientError('NoSuchKey')
+        stored = self.objects[Key]
+        response = {'Body': io.BytesIO(stored['Body'])}
+        if stored['ContentEncoding']:
+            response['ContentEncoding'] = stored['ContentEncoding']
+        return response
+
+
+class TestS3StorageBackend(unittest.TestCase):
+    """Test cases for S3StorageBackend against a mocked client."""
+
+    def setUp(self):
+        from src.utils.storage import aws_s3
+        self.client = _FakeS3Client()
+        patcher = mock.patch.multiple(
+            aws_s3, create=True, S3_AVAILABLE=True, TransferConfig=mock.Mock(), Config=mock.Mock(),
+            ClientError=_ClientError, NoCredentialsError=_NotFound,
+            boto3=SimpleNamespace(client=lambda *args, **kwargs: self.client,
+                                  resource=lambda *args, **kwargs: mock.Mock()),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.backend = aws_s3.S3StorageBackend('docs')
+
+    def test_gzip_round_trip(self):
+        """Test bodies from GZIP_MIN_SIZE on are stored gzipped and read back as given."""
+        from src.utils.storage.base import GZIP_MIN_SIZE
+        small = b'x' * (GZIP_MIN_SIZE - 1)
+        large = b'x' * GZIP_MIN_SIZE
+        self.backend.save_file('small.md', small)
+        self.backend.save_file('large.md', large)
+        self.assertIsNone(self.client.objects['small.md']['ContentEncoding'])
+        self.assertEqual(self.client.objects['small.md']['Body'], small)
+        self.assertEqual(self.client.objects['large.md']['ContentEncoding'], 'gzip')
+        self.assertEqual(gzip.decompress(self.client.objects['large.md']['Body']), large)
+        self.assertEqual(self.backend.get_file('small.md'), small)
+        self.assertEqual(self.backend.get_file('large.md'), large)
+
+    def test_get_file_missing(self):
+        """Test a missing key returns None and is remembered as missing."""
+        self.assertIsNone(self.backend.get_file('missing.md'))
+        self.assertFalse(self.backend.exists('missing.md'))
+        self.assertEqual(self.client.gets, 1)
+
+    def test_get_file_bad_body(self):
+        """Test a body that doesn't decode returns None instead of raising."""
+        self.client.objects['bad.md'] = {'Body': b'not gzip', 'ContentEncoding': 'gzip'}
+        self.assertIsNone(self.backend.get_file('bad.md'))
+
 
 if __name__ == '__main__':
     unittest.main()
-
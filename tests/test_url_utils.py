@@ -1,6 +1,7 @@
 """Tests for URL utility functions."""
 import unittest
-from src.utils.url_utils import is_valid_url, url_to_filepath, should_add_to_queue, NON_HTML_EXTENSIONS
+from urllib.parse import urlparse
+from src.utils.url_utils import is_valid_url, url_to_filepath, should_add_to_queue, split_netloc_path, NON_HTML_EXTENSIONS
 from collections import deque
 
 
@@ -40,6 +41,30 @@ class TestURLUtils(unittest.TestCase):
                 "/docs"
             ))
     
+    def test_is_valid_url_non_html_extension_case(self):
+        """Test extensions are matched case-insensitively and only at the end of the path."""
+        self.assertFalse(is_valid_url("https://example.com/docs/Image.PNG", "example.com", "/docs"))
+        self.assertTrue(is_valid_url("https://example.com/docs/png-guide", "example.com", "/docs"))
+        self.assertTrue(is_valid_url("https://example.com/docs/page?f=a.pdf", "example.com", "/docs"))
+    
+    def test_is_valid_url_prefix_fast_path(self):
+        """Test URLs matching the base prefix still get the host and extension checks right."""
+        self.assertTrue(is_valid_url("http://example.com/docs/page#a.png", "example.com", "/docs"))
+        self.assertFalse(is_valid_url("https://example.com/docs/file.pdf?dl=1", "example.com", "/docs"))
+        self.assertFalse(is_valid_url("https://example.com.evil.com/page", "example.com", ""))
+        self.assertFalse(is_valid_url("https://example.com/docs/file.pd\tf", "example.com", "/docs"))
+    
+    def test_split_netloc_path_matches_urlparse(self):
+        """Test the fast splitter agrees with urlparse, including the odd cases it hands off."""
+        for url in ["https://example.com/docs/page", "https://example.com", "https://example.com?q=/a",
+                    "http://a.com/p#f?g", "/redirect?to=http://x.com/a", "//cdn.com/x",
+                    "http://a.com/a;b/c;d", "HTTP://User@A.com:80/P",
+                    "https://exa\tmple.com/docs/a", "https://example.com/do\ncs/a",
+                    "https://example.com/docs/a\r", "1http://example.com/docs/a",
+                    "\uff48ttp://example.com/docs/a", "svn+ssh://example.com/docs/a"]:
+            parsed = urlparse(url)
+            self.assertEqual(split_netloc_path(url), (parsed.netloc, parsed.path), url)
+    
     def test_url_to_filepath_basic(self):
         """Test URL to filepath conversion."""
         result = url_to_filepath(